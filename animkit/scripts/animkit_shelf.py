@@ -108,6 +108,41 @@ class animkitshelf(_shelf):
         render_all_layers = self.addSubMenu(p, "Render All Separate Render Layers")
         self.addMenuItem(render_all_layers, label="Render With Padding", command=animkit_zoetrope.render_w_padding)
         self.addMenuItem(render_all_layers, label="Render Without Padding", command=animkit_zoetrope.render_nopadding)
+        self.addMenuItem(render_all_layers, label="Progressive Render With Padding", command=animkit_zoetrope.render_w_padding_progressive)
+        self.addMenuItem(render_all_layers, label="Progressive Render Without Padding", command=animkit_zoetrope.render_nopadding_progressive)
+        self.addMenuItem(render_all_layers, label="Render With Padding, Skip Static Frames", command=animkit_zoetrope.render_w_padding_skip_static)
+        self.addMenuItem(render_all_layers, label="Render Without Padding, Skip Static Frames", command=animkit_zoetrope.render_nopadding_skip_static)
+        self.addMenuItem(render_all_layers, label="Render Changed Frames Only With Padding", command=animkit_zoetrope.render_w_padding_changed)
+        self.addMenuItem(render_all_layers, label="Render Changed Frames Only Without Padding", command=animkit_zoetrope.render_nopadding_changed)
+        self.addMenuItem(render_all_layers, label="Render and Stream to MP4 With Padding", command=animkit_zoetrope.render_w_padding_stream)
+        self.addMenuItem(render_all_layers, label="Render and Stream to MP4 Without Padding", command=animkit_zoetrope.render_nopadding_stream)
+        self.addMenuItem(render_all_layers, label="Render via Local Scratch With Padding", command=animkit_zoetrope.render_w_padding_scratch)
+        self.addMenuItem(render_all_layers, label="Render via Local Scratch Without Padding", command=animkit_zoetrope.render_nopadding_scratch)
+        self.addMenuItem(render_all_layers, label="Render Selected Cameras With Padding", command=animkit_zoetrope.render_w_padding_selected_cameras)
+        self.addMenuItem(render_all_layers, label="Render Selected Cameras Without Padding", command=animkit_zoetrope.render_nopadding_selected_cameras)
+        self.addMenuItem(render_all_layers, label="Render in Benchmarked Format With Padding", command=animkit_zoetrope.render_w_padding_auto_format)
+        self.addMenuItem(render_all_layers, label="Render in Benchmarked Format Without Padding", command=animkit_zoetrope.render_nopadding_auto_format)
+
+        render_draft = self.addSubMenu(p, "Draft Render All Layers")
+        self.addMenuItem(render_draft, label="Draft Render With Padding", command=animkit_zoetrope.render_w_padding_draft)
+        self.addMenuItem(render_draft, label="Draft Render Without Padding", command=animkit_zoetrope.render_nopadding_draft)
+
+        self.addMenuItem(p, label="Resume Last Batch", command=animkit_zoetrope.render_resume_last_batch)
+        self.addMenuItem(p, label="Convert Scene Textures to TX", command=animkit_zoetrope.convert_textures_tx)
+        self.addMenuItem(p, label="Benchmark Image Formats", command=animkit_zoetrope.benchmark_image_formats)
+
+        render_workers = self.addSubMenu(p, "Render All Layers in Background Workers")
+        self.addMenuItem(render_workers, label="Render With Padding in Workers", command=animkit_zoetrope.render_w_padding_workers)
+        self.addMenuItem(render_workers, label="Render Without Padding in Workers", command=animkit_zoetrope.render_nopadding_workers)
+
+        render_kick = self.addSubMenu(p, "Render All Layers with Arnold Kick")
+        self.addMenuItem(render_kick, label="Export and Kick With Padding", command=animkit_zoetrope.render_w_padding_kick)
+        self.addMenuItem(render_kick, label="Export and Kick Without Padding", command=animkit_zoetrope.render_nopadding_kick)
+        render_queue = self.addSubMenu(p, "Shared Render Queue")
+        self.addMenuItem(render_queue, label="Publish Queue With Padding", command=animkit_zoetrope.publish_queue_w_padding)
+        self.addMenuItem(render_queue, label="Publish Queue Without Padding", command=animkit_zoetrope.publish_queue_nopadding)
+        self.addMenuItem(render_queue, label="Join Queue on This Workstation", command=animkit_zoetrope.join_queue)
+        self.addMenuItem(render_queue, label="Show Queue Status", command=animkit_zoetrope.queue_status)
 
         render_default_layers = self.addSubMenu(p, "Render Only Current Render Layer")
         self.addMenuItem(render_default_layers, label="Render Current Layer With Padding", command=animkit_zoetrope.render_default_w_padding)
@@ -116,10 +151,13 @@ class animkitshelf(_shelf):
         render_frame = self.addSubMenu(p, "Render Current Frame")
         self.addMenuItem(render_frame, label="Render Current Frame in PNG", command=animkit_zoetrope.render_one_frame_png)
         self.addMenuItem(render_frame, label="Render Current Frame in TIF", command=animkit_zoetrope.render_one_frame_tif)
+        self.addMenuItem(render_frame, label="Render Current Frame in Tiles, PNG", command=animkit_zoetrope.render_one_frame_tiled_png)
+        self.addMenuItem(render_frame, label="Render Current Frame in Tiles, TIF", command=animkit_zoetrope.render_one_frame_tiled_tif)
 
         zoetrope_smart_encoder = self.addSubMenu(p, "Zoetrope Smart Video Encoder")
         self.addMenuItem(zoetrope_smart_encoder, label="Encode All Renders with Compressed MP4", command=animkit_zoetrope.smart_convert_all_renders_compressed)
         self.addMenuItem(zoetrope_smart_encoder, label="Encode All Renders with Lossless AVI", command=animkit_zoetrope.smart_convert_all_renders_lossless)
+        self.addMenuItem(zoetrope_smart_encoder, label="Encode Progressive Preview MP4", command=animkit_zoetrope.smart_convert_all_renders_preview)
 
         # Timelapse
         # self.addButton(label="Timelapse Creator", 
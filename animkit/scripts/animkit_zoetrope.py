@@ -1,9 +1,22 @@
 from pymel.core import *
 import maya.mel as mel
 import maya.cmds as cmds
+import maya.utils
 import random as r
-import shutil, subprocess, sys, getpass, time, os, platform
+import shutil, subprocess, sys, getpass, time, os, platform, threading, stat, hashlib, traceback, tempfile, json
 from mtoa.cmds.arnoldRender import arnoldRender
+import animkit_zoetrope_pool
+import animkit_zoetrope_manifest
+import animkit_zoetrope_telemetry
+import animkit_zoetrope_queue
+import animkit_zoetrope_tiles
+import animkit_zoetrope_stream
+import animkit_zoetrope_resources
+import animkit_zoetrope_textures
+import animkit_zoetrope_history
+import animkit_zoetrope_transfer
+import animkit_zoetrope_codecs
+import animkit_zoetrope_sequences
 from os import listdir
 from os.path import isfile, join
 
@@ -13,6 +26,10 @@ UPDATE = "Aug 26, 2020"
 NEW = "Zoetrope 2.2 brings bug fixes as well as new features like automatic padding detection, frame range prompt, etc."
 
 
+# Folders Zoetrope keeps for itself inside /renders, e.g. /renders/zoetrope_snapshot. These are not render layers.
+ZOETROPE_FOLDER_PREFIX = "zoetrope_"
+
+
 # =================================================== Maya Elements ===================================================
 # Current Timeline
 class TimelineProperties:
@@ -52,45 +69,23 @@ def get_frame_rate():
     current_time = cmds.currentUnit(query=True, time=True)
     return FRAMERATE_INFO.get(current_time)
 
-def toggle_render_settings():
-    # Mainly, this should set the render setting to name_#.ext so stuff can move forward.
-
-    # This controls the "_" in the padding, 0 for nothing, 1 for ".", and 2 for "_".
-    cmds.setAttr("defaultRenderGlobals.periodInExt", 2)  
-    
-    # This controls the "ext". Setting this to 0 makes name_#.ext while 1 makes name.#
-    cmds.setAttr("defaultRenderGlobals.outFormatControl", 0)  
-
-    # This controls whether you want to render a single frame. 0 for single frame, and 1 for the animation.
-    cmds.setAttr("defaultRenderGlobals.animation", 1)
-
-    # This controls whether you want the extension or the frame number to go first in the file name.
-    cmds.setAttr("defaultRenderGlobals.putFrameBeforeExt", 1)
-
-    # This controls whether you want the extension ".ext" to be in your image name at all.
-    cmds.setAttr("defaultRenderGlobals.outFormatControl", 0)
-    print("[Zoetrope] Set Padding - Render settings correctly set.")
-
-# =================================================== Arnold Driver Global Setting ===================================================
-# An attempt to fix the global render path location problem
-global DEFAULTARNOLDDRIVER_PRE
-DEFAULTARNOLDDRIVER_PRE = ""
-
-def cache_defaultArnoldDriver_pre():
+def get_renders_folder():
     '''
-    Returns an string of the defaultArnoldDriver.pre
+    Returns the /renders folder next to the current scene file.
     '''
-    global DEFAULTARNOLDDRIVER_PRE
-    DEFAULTARNOLDDRIVER_PRE = cmds.getAttr("defaultArnoldDriver.pre")
-    print("[Zoetrope] Arnold Driver Global Setting - Successfully get and cached defaultArnoldDriver.pre settings: " + DEFAULTARNOLDDRIVER_PRE)
+    return (sceneName().parent + "\\renders").replace('\\', '/')
 
-def set_defaultArnoldDriver_pre():
+def get_render_layers(useDefaultRenderLayer = False):
     '''
-    Sets the defaultArnoldDriver.pre to its original state.
+    Returns a list of render layers to render, in display order.
     '''
-    cmds.setAttr("defaultArnoldDriver.pre", DEFAULTARNOLDDRIVER_PRE, type="string")
-    print("[Zoetrope] Arnold Driver Global Setting - Successfully reset defaultArnoldDriver.pre settings to original: " + DEFAULTARNOLDDRIVER_PRE)
+    if useDefaultRenderLayer: return ["defaultRenderLayer"]
+
+    render_layers = {cmds.getAttr( i + ".displayOrder") : i for i in cmds.ls(type='renderLayer')}
+    render_layers.pop(0)  # Gets rid of "defaultRenderLayer"
+    return [render_layers[index] for index in sorted(render_layers)]
 
+# =================================================== Arnold Driver Global Setting ===================================================
 def fix_defaultArnoldDriver_pre(self):
     '''
     Sets the defaultArnoldDriver.pre to its original state of "".
@@ -99,76 +94,1241 @@ def fix_defaultArnoldDriver_pre(self):
     print("[Zoetrope] Arnold Driver Global Setting - Successfully fixed defaultArnoldDriver.pre settings to original.")
 # =================================================== Zoetrope Renderer ===================================================
 # Render Functions
-def render_frame(width, height, frame, file_format="tif", render_layer = "defaultRenderLayer", image_padding = get_padding()):
+def get_frame_prefix(render_layer = "defaultRenderLayer"):
+    '''
+    Returns the image file prefix of a render layer, scene_folder/renders/render_layer/scene_name.
+    '''
+    return get_renders_folder() + "/" + render_layer + "/" + os.path.basename(sceneName()).split('.')[0]
+
+def get_output_folder(render_layer, folder_suffix = "", camera = None):
+    '''
+    Returns the folder inside /renders a render layer renders into, render_layer + folder_suffix[/camera].
+    '''
+    output_folder = render_layer + folder_suffix
+    if camera: output_folder += "/" + camera.split("|")[-1].replace(":", "_")
+    return output_folder
+
+def get_selected_cameras():
+    '''
+    Returns the transforms of the selected cameras, in selection order.
+    '''
+    cameras = []
+    for node in cmds.ls(selection=True, long=True) or []:
+        shapes = [node] if cmds.nodeType(node) == "camera" else cmds.listRelatives(node, shapes=True, type="camera", fullPath=True) or []
+        for shape in shapes:
+            transform = cmds.listRelatives(shape, parent=True, fullPath=True)[0]
+            if transform not in cameras: cameras.append(transform)
+    return cameras
+
+def get_frame_path(frame, file_format = "tif", render_layer = "defaultRenderLayer"):
+    '''
+    Returns the path render_frame() leaves the image of a frame at, scene_folder/renders/render_layer/scene_name_####.ext.
+    '''
+    return get_frame_prefix(render_layer) + "_" + padding_format(int(frame), get_padding()) + "." + file_format
+
+# Scratch renders go to $ZOETROPE_SCRATCH (e.g. a local SSD or tmpfs), or the temp folder of the system.
+SCRATCH_ENV = "ZOETROPE_SCRATCH"
+
+def get_scratch_folder():
+    '''
+    Returns the local folder frames of this scene render to before they are moved into /renders.
+    '''
+    root = os.getenv(SCRATCH_ENV) or tempfile.gettempdir()
+    return (root + "/" + ZOETROPE_FOLDER_PREFIX + "scratch/" + get_shot_name()).replace('\\', '/')
+
+def finalise_frame(image_path, render_layer, frame, on_finalised = None):
+    '''
+    HELPER for RenderSession. Runs on a background thread while the next frame renders.
+    Makes sure the image landed at image_path and is writable for the rest of the team, then calls
+    on_finalised(render_layer, frame, image_path).
+    '''
+    # Older setups still add the weird _1_ to the file name, move those images to their final name.
+    folder, file_name = os.path.split(image_path)
+    name, padded_frame = file_name.rsplit("_", 1)
+    legacy_path = os.path.join(folder, name + "_1_" + padded_frame)
+    if os.path.exists(legacy_path):
+        if os.path.exists(image_path): os.remove(image_path)
+        os.rename(legacy_path, image_path)
+
+    if not os.path.isfile(image_path):
+        raise Exception("[ZOETROPE] ERROR: finalise_frame() - Arnold did not write " + image_path + " !!!")
+    os.chmod(image_path, stat.S_IMODE(os.stat(image_path).st_mode) | stat.S_IWRITE | stat.S_IRGRP | stat.S_IWGRP | stat.S_IROTH)
+
+    if on_finalised is not None:
+        on_finalised(render_layer, frame, image_path)
+
+def render_frame(width, height, frame, file_format="tif", render_layer = "defaultRenderLayer"):
     '''
     HELPER for batch_render().
-    Render the selected frame into scene_folder/renders/render_layer/ folder.
+    Render the selected frame into scene_folder/renders/render_layer/ folder and returns the image path.
+    Opens a RenderSession for this one frame, batches should open one RenderSession for all of their frames instead.
     '''
-    # ====================================== Cache defaultArnoldDriver.pre ======================================
-    frame = int(frame)
-    print("[Zoetrope] Frame Renderer - Currently rendering frame " + str(frame) + " .")
-    cache_defaultArnoldDriver_pre()
-
-    # ====================================== Render the frame ======================================
-    file_dir = (sceneName().parent + "\\renders\\" + render_layer).replace('\\', '/')
-    prepend = os.path.basename(sceneName()).split('.')[0]
-    cmds.setAttr("defaultArnoldDriver.ai_translator", file_format, type="string")
-    cmds.setAttr("defaultArnoldDriver.pre", file_dir + "\\" + prepend, type="string")
-    cmds.setAttr("render_camShape.mask", 1)
-    arnoldRender(width, height, True, True,'render_cam', ' -layer ' + render_layer)
-
-    # ====================================== Fix the weird _1_ bug ======================================
-    # Known bug: The result file generated by arnoldRender() adds a _1_ to the file name
-    bug = "_1_"  # idk whyyyy does this happen 
-    prefix_image_dir = file_dir + "\\" + prepend + bug + "{:0>4d}".format(frame) + "." + file_format
-    postfix_image_dir = file_dir + "\\" + prepend + "_" + "{:0>4d}".format(frame) + "." + file_format
-    # print("[Zoetrope] Frame Renderer - Prefix Image Directory: " + prefix_image_dir)  # Debug
-    # print("[Zoetrope] Frame Renderer - Postfix Image Directory: " + postfix_image_dir)  # Debug
-    
-    if os.path.exists(postfix_image_dir): 
-        os.remove(postfix_image_dir)
-        if not os.path.exists(postfix_image_dir):
-            print("[Zoetrope] Frame Renderer - Image exists at: " + postfix_image_dir + " and got deleted successfully.")
+    with RenderSession(file_format) as session:
+        session.switch_layer(render_layer)
+        return session.render(width, height, frame, render_layer)
 
-    os.rename(prefix_image_dir,postfix_image_dir)
 
-    # ====================================== Reset defaultArnoldDriver.pre ======================================
-    set_defaultArnoldDriver_pre()
-    
+# =================================================== Zoetrope Render Session ===================================================
+# Frames are named name_#.ext. The driver prefix is left empty, the image file prefix alone names the frames.
+RENDER_SETTINGS = {"defaultRenderGlobals.periodInExt": 2,
+                   "defaultRenderGlobals.outFormatControl": 0,
+                   "defaultRenderGlobals.animation": 1,
+                   "defaultRenderGlobals.putFrameBeforeExt": 1,
+                   "defaultArnoldDriver.pre": ""}
+
+# Threads finalising frames in the background, this is file system work and needs few.
+FINALISER_THREADS = 2
 
+class RenderSession(object):
+    '''
+    Applies the render globals of a batch once and restores every attribute it touched exactly once on exit,
+    even when a frame raises. The current render layer and time are restored as well.
+    Frames are finalised on background threads, all of them are finished when the session exits.
+    With a scratch_folder frames render there and a FrameMover (see animkit_zoetrope_transfer) moves them into /renders
+    in batches, on_finalised only runs once a frame is verified in its final place.
+
+        with RenderSession("tif") as session:
+            for layer, frame in render_items:
+                session.switch_layer(layer)
+                cmds.currentTime(frame)
+                session.render(width, height, frame, layer)
+    '''
+
+    def __init__(self, file_format = "tif", overrides = None, folder_suffix = "", scratch_folder = None):
+        self.file_format = file_format
+        self.overrides = overrides or {}
+        self.folder_suffix = folder_suffix
+        self.scratch_folder = scratch_folder
+        self.finaliser = None
+        self.mover = None
+        self.finalise_errors = []
+        self._folders = set()
+        self._saved = []
+        self._original_layer = None
+        self._original_time = None
+
+    def __enter__(self):
+        self._original_layer = cmds.editRenderLayerGlobals(query=True, currentRenderLayer=True)
+        self._original_time = cmds.currentTime(query=True)
+
+        for attr, value in RENDER_SETTINGS.items():
+            self.set(attr, value)
+        self.set("defaultArnoldDriver.ai_translator", self.file_format)
+        for attr, value in self.overrides.items():
+            self.set(attr, value)
+        self.finaliser = animkit_zoetrope_pool.TaskPool(FINALISER_THREADS)
+        if self.scratch_folder:
+            # Move failures count as finalise failures.
+            self.mover = animkit_zoetrope_transfer.FrameMover(errors = self.finaliser.errors)
+            print("[Zoetrope] Render Session - Rendering to " + self.scratch_folder + " first.")
+        print("[Zoetrope] Render Session - Applied render settings for " + self.file_format + " frames.")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.finalise_errors = self.finaliser.close()
+        if self.mover is not None:
+            self.mover.close()
+            for folder in sorted(self._folders, reverse = True):
+                if folder.startswith(self.scratch_folder):
+                    try:
+                        os.rmdir(folder)
+                    except OSError:  # Frames that could not be moved stay in scratch.
+                        pass
+        for (layer, frame), error in self.finalise_errors:
+            print("[Zoetrope] Render Session - Could not finalise " + str(layer) + " frame " + str(frame) + ":\n" + error)
+
+        # One attribute that cannot be restored must not keep the others, the layer or the time from being restored.
+        restored = 0
+        try:
+            for attr, value, attr_type in reversed(self._saved):
+                try:
+                    self._set_attr(attr, value, attr_type)
+                    restored += 1
+                except Exception as e:
+                    print("[Zoetrope] Render Session - Could not restore " + attr + ": " + str(e))
+        finally:
+            switch_render_layer(self._original_layer)
+            cmds.currentTime(self._original_time)
+            print("[Zoetrope] Render Session - Restored " + str(restored) + " of " + str(len(self._saved)) + " render settings.")
+            self._saved = []
+        return False
+
+    def set(self, attr, value):
+        '''
+        Sets attr for the rest of the session. Its original value and type are remembered the first time it is set.
+        '''
+        if attr not in [saved_attr for saved_attr, saved_value, saved_type in self._saved]:
+            self._saved.append((attr, cmds.getAttr(attr), cmds.getAttr(attr, type=True)))
+        if cmds.getAttr(attr) != value:
+            self._set_attr(attr, value)
+
+    def _set_attr(self, attr, value, attr_type = None):
+        # Maya returns None for an empty string attribute, it has to be set back as "".
+        if attr_type == "string" or isinstance(value, (str, type(u""))):
+            cmds.setAttr(attr, value or "", type="string")
+        else:
+            cmds.setAttr(attr, value)
+
+    def use_camera(self, camera = "render_cam"):
+        '''
+        Turns on the mask of camera's shapes for the rest of the session, only cameras that render are touched.
+        '''
+        for shape in cmds.listRelatives(camera, shapes=True, type="camera", fullPath=True) or []:
+            self.set(shape + ".mask", 1)
+
+    def switch_layer(self, layer):
+        if cmds.editRenderLayerGlobals(query=True, currentRenderLayer=True) != layer:
+            print("[ZOETROPE] Render Session - Current Render Layer: " + str(layer))
+            switch_render_layer(layer)
+
+    def wait(self):
+        '''
+        Waits until every frame rendered so far is finalised.
+        '''
+        self.finaliser.wait()
+        if self.mover is not None: self.mover.wait()
+
+    def _move_when_finalised(self, image_path, on_finalised):
+        '''
+        Returns the on_finalised of a scratch frame, it hands the frame to the mover and calls on_finalised once it is moved.
+        '''
+        def move(output_folder, frame, scratch_path):
+            on_moved = None if on_finalised is None else lambda destination: on_finalised(output_folder, frame, destination)
+            self.mover.submit(scratch_path, image_path, info = (output_folder, frame), on_moved = on_moved)
+        return move
+
+    def render(self, width, height, frame, render_layer = "defaultRenderLayer", on_finalised = None, output_folder = None, camera = "render_cam"):
+        '''
+        Renders the current time as frame through camera into scene_folder/renders/render_layer + folder_suffix/ and returns the image path.
+        output_folder, relative to /renders, replaces render_layer + folder_suffix.
+        The image is finalised in the background, on_finalised(output_folder, frame, image_path) is called once it is in place.
+        '''
+        frame = int(frame)
+        print("[Zoetrope] Frame Renderer - Currently rendering frame " + str(frame) + " .")
+        output_folder = output_folder or render_layer + self.folder_suffix
+        image_path = get_frame_path(frame, self.file_format, output_folder)
+        prefix, render_path = get_frame_prefix(output_folder), image_path
+        if self.mover is not None:
+            prefix = self.scratch_folder + "/" + output_folder + "/" + get_shot_name()
+            render_path = prefix + image_path[len(get_frame_prefix(output_folder)):]
+        for folder in set([os.path.dirname(image_path), os.path.dirname(render_path)]):
+            if folder not in self._folders:
+                if not os.path.isdir(folder): os.makedirs(folder)
+                self._folders.add(folder)
+
+        # Held frames can be hard links of one image (see link_static_frames), Arnold writes into the file it finds in place.
+        for path in set([image_path, render_path]):
+            if os.path.exists(path): os.remove(path)
+
+        # ====================================== Render straight to the final name (or its scratch copy) ======================================
+        self.set("defaultRenderGlobals.imageFilePrefix", prefix)
+        self.use_camera(camera)
+        arnoldRender(width, height, True, True, camera, ' -layer ' + render_layer)
+
+        if self.mover is not None: on_finalised = self._move_when_finalised(image_path, on_finalised)
+        self.finaliser.submit(finalise_frame, render_path, output_folder, frame, on_finalised, info = (output_folder, frame))
+        return image_path
+
+
+# =================================================== Zoetrope Scheduler ===================================================
+# Rendering every layer of a frame back to back saves time changes (heavy rigs), rendering every frame of a layer back to back
+# saves render layer switches (light rigs). The scheduler times both on a few sample frames and picks the cheaper order.
+RENDER_ORDERS = ["auto", "layer", "frame"]
+
+def switch_render_layer(layer):
+    '''
+    Makes layer the current render layer, unless it already is.
+    '''
+    if cmds.editRenderLayerGlobals(query=True, currentRenderLayer=True) != layer:
+        cmds.editRenderLayerGlobals(currentRenderLayer=layer)
+
+def measure_schedule_costs(render_layers, frames, samples = 3):
+    '''
+    Returns the average seconds of one time change and of one render layer switch, measured on up to samples frames.
+    '''
+    step = max(1, len(frames) // samples)
+    sample_frames = frames[::step][:samples]
+
+    time_costs = []
+    for frame in sample_frames:
+        start = time.time()
+        cmds.currentTime(frame)
+        time_costs.append(time.time() - start)
+
+    switch_costs = []
+    if len(render_layers) > 1:
+        for frame in sample_frames:
+            cmds.currentTime(frame)
+            for layer in render_layers:
+                start = time.time()
+                switch_render_layer(layer)
+                switch_costs.append(time.time() - start)
+
+    average = lambda costs: sum(costs) / len(costs) if costs else 0.0
+    return average(time_costs), average(switch_costs)
+
+def choose_render_order(layer_count, frame_count, time_cost, switch_cost):
+    '''
+    Returns ("layer" or "frame", {order: estimated overhead seconds}).
+    Layer order changes time for every layer and frame but switches layers once per layer,
+    frame order changes time once per frame but switches layers for every layer and frame.
+    '''
+    estimates = {"layer": layer_count * frame_count * time_cost + layer_count * switch_cost,
+                 "frame": frame_count * time_cost + frame_count * layer_count * switch_cost}
+    if layer_count < 2: return "layer", estimates
+    return min(estimates, key = estimates.get), estimates
+
+def plan_render_items(render_layers, frames, order):
+    '''
+    Returns the (layer, frame) pairs of a batch in the given order, "layer" (layer outer) or "frame" (frame outer).
+    '''
+    if order == "frame":
+        return [(layer, frame) for frame in frames for layer in render_layers]
+    return [(layer, frame) for layer in render_layers for frame in frames]
 
-def batch_render(renderStart, renderEnd, width = get_resolution_settings("width"), height = get_resolution_settings("height"), target_format = "tif", useDefaultRenderLayer = False):
+def progressive_frame_order(frames):
+    '''
+    Returns frames in coarse to fine order: first, last, middle, then the quarter points and so on.
+    Example: progressive_frame_order([1, ..., 9]) -> [1, 9, 5, 3, 7, 2, 4, 6, 8]
+    '''
+    frames = list(frames)
+    if len(frames) < 3: return frames
+
+    ordered = [frames[0], frames[-1]]
+    intervals = [(0, len(frames) - 1)]
+    while intervals:
+        finer_intervals = []
+        for low, high in intervals:
+            if high - low < 2: continue
+            middle = (low + high) // 2
+            ordered.append(frames[middle])
+            finer_intervals += [(low, middle), (middle, high)]
+        intervals = finer_intervals
+    return ordered
+
+def schedule_render_items(render_layers, frames, order = "auto"):
+    '''
+    Returns (list of (layer, frame) pairs, summary text). With order = "auto" the cheaper order is measured.
+    '''
+    if order not in RENDER_ORDERS:
+        raise Exception("[ZOETROPE] ERROR: schedule_render_items() - order must be one of " + str(RENDER_ORDERS) + "!!!")
+    if order != "auto":
+        return plan_render_items(render_layers, frames, order), "Render order: " + order + " outer (requested)."
+
+    time_cost, switch_cost = measure_schedule_costs(render_layers, frames)
+    order, estimates = choose_render_order(len(render_layers), len(frames), time_cost, switch_cost)
+    summary = ("Render order: " + order + " outer (time change %.3fs, layer switch %.3fs, estimated overhead %.1fs layer outer vs %.1fs frame outer)."
+               % (time_cost, switch_cost, estimates["layer"], estimates["frame"]))
+    return plan_render_items(render_layers, frames, order), summary
+
+# =================================================== Zoetrope Static Frames ===================================================
+# Holds render the same image over and over. Hashing what the renderer would see on every frame finds them up front.
+def get_fingerprint_plugs():
+    '''
+    Returns the plugs whose evaluated values describe a frame: every animated attribute, every attribute driven by an
+    expression, and the world matrix and keyable attributes of every camera and light.
+    Returns None if something else depends on time (caches, simulations), those frames can never be told apart cheaply.
+    '''
+    plugs = set()
+    for node in cmds.listConnections("time1.outTime", source=False, destination=True) or []:
+        if "animCurve" not in cmds.nodeType(node, inherited=True) and cmds.nodeType(node) != "expression":
+            print("[Zoetrope] Static Frames - " + node + " depends on time, every frame will be rendered.")
+            return None
+
+    for node in (cmds.ls(type="animCurve") or []) + (cmds.ls(type="expression") or []):
+        plugs.update(cmds.listConnections(node, plugs=True, source=False, destination=True, skipConversionNodes=True) or [])
+
+    for shape in (cmds.ls(type="camera") or []) + (cmds.ls(lights=True) or []):
+        plugs.update(shape + "." + attr for attr in cmds.listAttr(shape, keyable=True, scalar=True) or [])
+        for transform in cmds.listRelatives(shape, parent=True, fullPath=True) or []:
+            plugs.add(transform + ".worldMatrix[0]")
+    return sorted(plugs)
+
+def round_values(value, digits = 6):
+    '''
+    Returns value with every float rounded, so evaluation noise does not change a fingerprint.
+    '''
+    if isinstance(value, float): return round(value, digits)
+    if isinstance(value, (list, tuple)): return [round_values(item, digits) for item in value]
+    return value
+
+def get_frame_fingerprints(frames, settings = ""):
+    '''
+    Returns {frame: md5 of the evaluated fingerprint plugs at that frame}, evaluated without changing the current time.
+    settings (resolution, format...) is hashed into every fingerprint, so changing them makes every frame look changed.
+    Returns None if frames cannot be fingerprinted, see get_fingerprint_plugs.
+    '''
+    plugs = get_fingerprint_plugs()
+    if plugs is None: return None
+
+    fingerprints = {}
+    for frame in frames:
+        values = [round_values(cmds.getAttr(plug, time=frame)) for plug in plugs]
+        fingerprints[frame] = hashlib.md5((repr(values) + settings).encode("utf-8")).hexdigest()
+    return fingerprints
+
+def find_static_runs(frames, fingerprints):
+    '''
+    Returns {frame: first frame of its run} for every frame that looks exactly like the frame before it.
+    Example: fingerprints a, a, b, b, b of frames 1 to 5 -> {2: 1, 4: 3, 5: 3}
+    '''
+    holds = {}
+    frames = sorted(frames)
+    for previous, frame in zip(frames, frames[1:]):
+        if frame == previous + 1 and fingerprints[frame] == fingerprints[previous]:
+            holds[frame] = holds.get(previous, previous)
+    return holds
+
+def link_static_frames(holds, render_layers, target_format, folder_suffix = "", manifest = None, fingerprints = None):
+    '''
+    Gives every held frame the image of the first frame of its run, as a hard link or else as a copy.
+    Returns how many images were linked.
+    '''
+    linked = 0
+    for layer in render_layers:
+        for frame, source_frame in sorted(holds.items()):
+            source = get_frame_path(source_frame, target_format, layer + folder_suffix)
+            destination = get_frame_path(frame, target_format, layer + folder_suffix)
+            if not os.path.isfile(source): continue
+            if os.path.exists(destination): os.remove(destination)
+            try:
+                os.link(source, destination)
+            except (AttributeError, OSError):  # No hard links on Windows in Python 2, or across devices.
+                shutil.copyfile(source, destination)
+            if manifest is not None: manifest.record(layer + folder_suffix, frame, destination, fingerprint = (fingerprints or {}).get(frame))
+            linked += 1
+    return linked
+
+
+# =================================================== Zoetrope Texture Pre-flight ===================================================
+# Tiled, mipmapped .tx textures are converted once before a batch instead of Arnold reading untiled images every frame.
+def get_file_textures():
+    '''
+    Returns every image the file nodes of the scene read, every tile of UDIM textures included.
+    '''
+    sources = set()
+    for node in cmds.ls(type="file") or []:
+        path = ""
+        if cmds.getAttr(node + ".uvTilingMode"): path = cmds.getAttr(node + ".computedFileTextureNamePattern") or ""
+        path = path or cmds.getAttr(node + ".fileTextureName") or ""
+        if not path: continue
+        if not os.path.isabs(path): path = cmds.workspace(expandName=path)
+        sources.update(animkit_zoetrope_textures.expand_texture_path(path))
+    return sorted(sources)
+
+def preflight_textures(max_procs = None, command = None):
+    '''
+    Converts the textures of the scene that changed since their last conversion to .tx with a pool of maketx processes.
+    command(source, tx_path) returns the argv of one conversion, see animkit_zoetrope_textures.maketx_command.
+    Returns (RenderSession overrides that make Arnold use the .tx files, summary text). Without maketx nothing changes.
+    If any conversion fails nothing is overridden, an older .tx of that texture (autotx, an artist, a shared library)
+    is left alone and Arnold keeps checking the textures itself.
+    '''
+    import multiprocessing
+    if command is None:
+        maketx = animkit_zoetrope_textures.find_maketx()
+        if maketx is None:
+            print("[Zoetrope] Texture Pre-flight - maketx not found, textures are left as they are.")
+            return {}, "maketx not found, textures are left as they are."
+        command = animkit_zoetrope_textures.maketx_command(maketx)
+
+    # maketx threads on its own as well.
+    max_procs = max_procs or max(1, multiprocessing.cpu_count() // 4)
+    cache = animkit_zoetrope_textures.TextureCache(get_renders_folder() + "/" + animkit_zoetrope_textures.TX_CACHE_NAME)
+    governor = animkit_zoetrope_resources.ResourceGovernor(max_procs, probe_first = False)
+    converted, unchanged, failed = animkit_zoetrope_textures.convert_textures(get_file_textures(), cache, command, max_procs, governor)
+    for result in failed: print("[Zoetrope] Texture Pre-flight - Could not convert " + result["source"] + ":\n" + result["error"])
+
+    summary = "Converted " + str(len(converted)) + " textures to .tx, " + str(len(unchanged)) + " were up to date."
+    if failed: summary += " Could not convert: " + ", ".join(os.path.basename(result["source"]) for result in failed)
+    if failed:
+        summary += " Arnold keeps its own .tx settings."
+        return {}, summary
+    return {"defaultArnoldRenderOptions.use_existing_tiled_textures": 1, "defaultArnoldRenderOptions.autotx": 0}, summary
+
+
+# =================================================== Zoetrope Image Codecs ===================================================
+# target_format is an image format ("tif", "png", "exr"), a codec of animkit_zoetrope_codecs.CODECS ("exr_piz"...)
+# or "auto" for the codec the last benchmark of this project picked.
+CODEC_FOLDER = ZOETROPE_FOLDER_PREFIX + "codecs"
+
+def run_codec_benchmark(sample = None, oiiotool = None, policy = None):
+    '''
+    Measures every codec on sample, or on the current frame of the current render layer rendered as EXR, and picks the
+    one batches with target_format = "auto" render to. Returns (results, chosen result or None), both are kept in
+    /renders/zoetrope_codecs.json.
+    '''
+    work_folder = get_renders_folder() + "/" + CODEC_FOLDER
+    if sample is None:
+        with RenderSession("exr") as session:
+            sample = session.render(get_resolution_settings("width"), get_resolution_settings("height"), cmds.currentTime(query=True),
+                                    cmds.editRenderLayerGlobals(query=True, currentRenderLayer=True), output_folder = CODEC_FOLDER)
+    results = animkit_zoetrope_codecs.benchmark_codecs(sample, work_folder, oiiotool)
+    choice = animkit_zoetrope_codecs.choose_codec(results, policy)
+    animkit_zoetrope_manifest.write_json_atomic(get_renders_folder() + "/" + animkit_zoetrope_codecs.CODEC_RESULTS_NAME,
+                                                {"sample": sample, "policy": dict(animkit_zoetrope_codecs.CODEC_POLICY, **(policy or {})),
+                                                 "results": results, "choice": choice["name"] if choice else None})
+    print("[Zoetrope] Codec Benchmark - Picked " + (choice["name"] if choice else "nothing, no codec meets the policy") + " .")
+    return results, choice
+
+def get_enum_index(attr, name):
+    '''
+    Returns the index of the enum field called name of attr, e.g. get_enum_index("defaultArnoldDriver.exrCompression", "piz").
+    '''
+    node, attribute = attr.split(".", 1)
+    index = 0
+    for field in cmds.attributeQuery(attribute, node=node, listEnum=True)[0].split(":"):
+        if "=" in field: field, index = field.split("=")[0], int(field.split("=")[1])
+        if field == name: return index
+        index += 1
+    raise Exception("[ZOETROPE] ERROR: get_enum_index() - " + attr + " has no " + name + "!!!")
+
+def resolve_target_format(target_format):
+    '''
+    Returns (image format, RenderSession overrides of its codec, codec) for a target_format of batch_render().
+    "auto" runs the codec benchmark unless this project has its result already, and renders TIFF if nothing meets the policy.
+    '''
+    if target_format == "auto":
+        results_path = get_renders_folder() + "/" + animkit_zoetrope_codecs.CODEC_RESULTS_NAME
+        if os.path.isfile(results_path):
+            with open(results_path) as f:
+                target_format = json.load(f).get("choice") or "tif"
+        else:
+            choice = run_codec_benchmark()[1]
+            target_format = choice["name"] if choice else "tif"
+        print("[Zoetrope] Codec Benchmark - Rendering " + target_format + " images.")
+    codec = animkit_zoetrope_codecs.get_codec(target_format)
+    if codec is None: return target_format, {}, target_format
+    overrides = {}
+    for attr, value in (codec["arnold"] or {}).items():
+        overrides[attr] = get_enum_index(attr, value) if isinstance(value, str) else value
+    return codec["format"], overrides, target_format
+
+
+# =================================================== Zoetrope Status Line ===================================================
+# Without the UI (mayapy, maya -batch) there is no progress bar, the status goes to the output instead.
+def begin_status_line(total):
+    '''
+    Starts Maya's main progress bar for total frames and returns it, None without the UI.
+    '''
+    if cmds.about(batch=True): return None
+    status_bar = mel.eval('$tmp = $gMainProgressBar')
+    cmds.progressBar(status_bar, edit=True, beginProgress=True, isInterruptable=False, status="Zoetrope: starting", maxValue=max(1, total))
+    return status_bar
+
+def update_status_line(status_bar, text):
+    if status_bar is None:
+        print("[Zoetrope] " + text)
+        return
+    cmds.progressBar(status_bar, edit=True, step=1, status=text)
+
+def end_status_line(status_bar):
+    if status_bar is None: return
+    cmds.progressBar(status_bar, edit=True, endProgress=True)
+
+
+# =================================================== Zoetrope Render History ===================================================
+# Render times of every batch go into a SQLite file in Maya's user folder, new batches are predicted from them.
+HISTORY_PATH = cmds.internalVar(userAppDir=True) + animkit_zoetrope_history.HISTORY_NAME
+
+def get_shot_name():
+    return os.path.basename(sceneName()).split('.')[0]
+
+def record_render_history(telemetry, width, height, target_format):
+    '''
+    Adds the frames of a finished batch to the render history.
+    '''
+    frames = [dict(entry, width = width, height = height, format = target_format) for entry in telemetry.frames.values()]
+    try:
+        recorded = animkit_zoetrope_history.RenderHistory(HISTORY_PATH).record(get_shot_name(), frames)
+        print("[Zoetrope] Render History - Recorded " + str(recorded) + " frames in " + HISTORY_PATH + " .")
+    except Exception as e:  # The history is a nice to have, never fail a batch over it.
+        print("[Zoetrope] Render History - Could not record the batch: " + str(e))
+
+def predict_batch_time(layers, frame_count, width, height):
+    '''
+    Returns a sentence predicting how long rendering frame_count frames of layers at width x height takes.
+    '''
+    try:
+        prediction = animkit_zoetrope_history.RenderHistory(HISTORY_PATH).predict(get_shot_name(), layers, frame_count, width, height)
+    except Exception as e:
+        print("[Zoetrope] Render History - Could not read the history: " + str(e))
+        prediction = None
+    if prediction is None:
+        return "No render history to predict this batch from yet."
+    seconds, used = prediction
+    return "Expected to take about " + animkit_zoetrope_telemetry.format_duration(seconds) + " (from " + str(used) + " frames rendered before)."
+
+
+# =================================================== Zoetrope Draft Tier ===================================================
+# Draft renders trade quality for speed for layout and lighting checks. They go to /renders/<layer>_draft/.
+DRAFT_RESOLUTION_SCALE = 0.5
+DRAFT_FOLDER_SUFFIX = "_draft"
+DRAFT_SAMPLE_CAPS = {"defaultArnoldRenderOptions.AASamples": 2,
+                     "defaultArnoldRenderOptions.GIDiffuseSamples": 1,
+                     "defaultArnoldRenderOptions.GISpecularSamples": 1,
+                     "defaultArnoldRenderOptions.GITransmissionSamples": 1,
+                     "defaultArnoldRenderOptions.GISssSamples": 1,
+                     "defaultArnoldRenderOptions.GIVolumeSamples": 1}
+
+def get_draft_resolution(width, height, scale = DRAFT_RESOLUTION_SCALE):
+    '''
+    Returns the (width, height) of a draft render, rounded down to even numbers so the draft video can be encoded.
+    '''
+    return max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2)
+
+def get_draft_overrides():
+    '''
+    Returns the sampling settings a draft render overrides, each capped at DRAFT_SAMPLE_CAPS.
+    '''
+    return {attr: min(cmds.getAttr(attr), cap) for attr, cap in DRAFT_SAMPLE_CAPS.items()}
+
+def start_stream_encoders(output_folders, frames, to_render, holds, target_format):
+    '''
+    HELPER for batch_render(). Starts one StreamingEncoder per output folder into /renders/<output folder>/<scene>.mp4.
+    to_render holds the (output folder, frame) pairs this batch renders. The other frames are added right away,
+    as their image on disk or as a hold of the frame before them.
+    '''
+    encoders = {}
+    for output_folder in output_folders:
+        if not os.path.isdir(get_renders_folder() + "/" + output_folder): os.makedirs(get_renders_folder() + "/" + output_folder)
+        encoder = animkit_zoetrope_stream.StreamingEncoder(frames, get_frame_prefix(output_folder) + ".mp4", target_format, get_frame_rate() or 24)
+        for frame in frames:
+            if (output_folder, frame) not in to_render:
+                encoder.add(frame, None if frame in holds else get_frame_path(frame, target_format, output_folder))
+        encoders[output_folder] = encoder
+    return encoders
+
+# A frame that raises while rendering or finalising goes to the back of the batch, at most this many times.
+MAX_FRAME_ATTEMPTS = 3
+
+# The exit message lists this many failed frames, the Script Editor has all of them.
+FAILED_FRAMES_SHOWN = 20
+
+class BatchRenderJob(object):
+    '''
+    The state of one batch_render(), split into steps so a JobController can run it without blocking Maya.
+    start() applies the render settings and plans the frames, every step() renders one frame, finish() restores the
+    scene, wraps up the batch and shows its exit message. finish(cancelled = True) leaves everything as consistent as
+    a finished batch, the frames rendered so far are recorded and can be resumed.
+    A frame that fails is queued again after the other frames, up to MAX_FRAME_ATTEMPTS times, then reported in failed.
+    With cameras, every step renders the frame through each camera into /renders/<layer>/<camera>/ while the scene
+    is evaluated at that frame. render_items stay (layer, frame), cameras_todo holds the cameras of an item when not all of them.
+    '''
+
+    def __init__(self, renderStart, renderEnd, width, height, target_format = "tif", useDefaultRenderLayer = False, resume = False, order = "auto",
+                 progressive = False, draft = False, skip_static = False, changed_only = False, stream = False, tx_preflight = True, scratch = False,
+                 cameras = None):
+        self.renderStart, self.renderEnd = renderStart, renderEnd
+        self.width, self.height = width, height
+        self.target_format = target_format
+        self.useDefaultRenderLayer = useDefaultRenderLayer
+        self.resume, self.order, self.progressive, self.draft = resume, order, progressive, draft
+        self.skip_static, self.changed_only, self.stream = skip_static, changed_only, stream
+        self.tx_preflight = tx_preflight
+        self.scratch = scratch
+        self.cameras = list(cameras or [])
+        self.cameras_todo = {}
+        self.tx_summary = ""
+        self.render_items = []
+        self.position = 0
+        self.session = None
+        self.attempts = {}
+        self.failed = {}
+        self.retried = 0
+        self._finalise_seen = 0
+
+    def start(self):
+        self.render_layers = get_render_layers(self.useDefaultRenderLayer)
+        self.folder_suffix = DRAFT_FOLDER_SUFFIX if self.draft else ""
+        # {output folder: (layer, camera)}, camera None renders through render_cam straight into the layer folder.
+        self.outputs = {}
+        for layer in self.render_layers:
+            for camera in self.cameras or [None]:
+                self.outputs[get_output_folder(layer, self.folder_suffix, camera)] = (layer, camera)
+        # The codec (e.g. "exr_piz") is what the manifest keeps, target_format becomes its image format.
+        self.target_format, overrides, self.codec = resolve_target_format(self.target_format)
+        self.manifest = animkit_zoetrope_manifest.RenderManifest(get_renders_folder())
+        if not (self.resume or self.changed_only):
+            self.manifest.start_batch(self.output_folders(), renderStart = self.renderStart, renderEnd = self.renderEnd,
+                                      width = self.width, height = self.height, target_format = self.codec, useDefaultRenderLayer = self.useDefaultRenderLayer,
+                                      draft = self.draft, skip_static = self.skip_static, scratch = self.scratch, cameras = self.cameras)
+
+        if self.draft:
+            self.width, self.height = get_draft_resolution(self.width, self.height)
+            overrides.update(get_draft_overrides())
+        if self.tx_preflight:
+            tx_overrides, self.tx_summary = preflight_textures()
+            overrides.update(tx_overrides)
+
+        # The session applies the render settings once and restores them once in finish(), whatever happens.
+        self.session = RenderSession(self.target_format, overrides, self.folder_suffix, get_scratch_folder() if self.scratch else None).__enter__()
+        try:
+            self._plan()
+        except Exception:
+            self.session.__exit__(*sys.exc_info())
+            raise
+
+    def _plan(self):
+        self.holds = {}
+        frames = list(range(self.renderStart, self.renderEnd + 1))
+        # The pre-pass samples every animated plug on every frame, only batches that use it pay for it.
+        self.fingerprints = None
+        if self.skip_static or self.changed_only:
+            self.fingerprints = get_frame_fingerprints(frames, "%dx%d %s" % (self.width, self.height, self.codec))
+        if self.skip_static:
+            if self.fingerprints is not None: self.holds = find_static_runs(frames, self.fingerprints)
+            frames = [frame for frame in frames if frame not in self.holds]
+            print("[ZOETROPE] Batch Render - " + str(len(self.holds)) + " frames hold the frame before them and will not be rendered.")
+
+        # Pick the render order.
+        order = self.order
+        if self.progressive:
+            frames = progressive_frame_order(frames)
+            if order == "auto": order = "frame"
+        render_items, self.order_summary = schedule_render_items(self.render_layers, frames, order)
+        print("[ZOETROPE] Batch Render - " + self.order_summary)
+        if self.resume:
+            render_items = self.filter_items(render_items, lambda output_folder, frame:
+                                             not self.manifest.is_done(output_folder, frame, get_frame_path(frame, self.target_format, output_folder)))
+        if self.changed_only and self.fingerprints is not None:
+            render_items = self.filter_items(render_items, lambda output_folder, frame:
+                                             not self.manifest.is_current(output_folder, frame, get_frame_path(frame, self.target_format, output_folder), self.fingerprints[frame]))
+        to_render = set((self.output_folder(layer, camera), frame) for layer, frame in render_items for camera in self.item_cameras(layer, frame))
+        self.skipped = len(self.outputs) * len(frames) - len(to_render)
+        self.render_items = render_items
+
+        self.encoders = {}
+        if self.stream and not animkit_zoetrope_stream.can_stream(self.target_format):
+            print("[Zoetrope] Streaming Encoder - " + self.target_format + " images cannot be streamed, the videos are encoded once the batch is done.")
+        elif self.stream:
+            self.encoders = start_stream_encoders(self.output_folders(), list(range(self.renderStart, self.renderEnd + 1)), to_render, self.holds, self.target_format)
+
+        # Telemetry of every frame, the ETA is shown in Maya's status line.
+        self.telemetry = animkit_zoetrope_telemetry.RenderTelemetry(len(to_render))
+        self.status_bar = begin_status_line(len(to_render))
+
+    def output_folders(self):
+        return sorted(self.outputs)
+
+    def output_folder(self, layer, camera):
+        return get_output_folder(layer, self.folder_suffix, camera)
+
+    def item_cameras(self, layer, frame):
+        '''
+        Returns the cameras (None for render_cam) the (layer, frame) item still renders.
+        '''
+        return self.cameras_todo.get((layer, frame), self.cameras or [None])
+
+    def filter_items(self, render_items, wanted):
+        '''
+        Keeps the cameras of every item for which wanted(output folder, frame) is True, and the items that keep any.
+        '''
+        kept = []
+        for layer, frame in render_items:
+            cameras = [camera for camera in self.item_cameras(layer, frame) if wanted(self.output_folder(layer, camera), frame)]
+            if cameras: kept.append((layer, frame))
+            if cameras != (self.cameras or [None]): self.cameras_todo[(layer, frame)] = cameras
+        return kept
+
+    def on_finalised(self, output_folder, frame, image_path):
+        '''
+        Runs on a finaliser thread once the image of a frame is in place.
+        '''
+        self.manifest.record(output_folder, frame, image_path, fingerprint = (self.fingerprints or {}).get(frame))
+        self.telemetry.record_output(output_folder, frame, os.path.getsize(image_path))
+        if output_folder in self.encoders: self.encoders[output_folder].add(frame, image_path)
+
+    @property
+    def done(self):
+        return self.position >= len(self.render_items)
+
+    def frame_failed(self, output_folder, frame, error):
+        '''
+        Queues the frame of output_folder again at the end of the batch, or gives up on it after MAX_FRAME_ATTEMPTS.
+        '''
+        attempts = self.attempts.get((output_folder, frame), 0) + 1
+        self.attempts[(output_folder, frame)] = attempts
+        if attempts < MAX_FRAME_ATTEMPTS:
+            print("[ZOETROPE] Batch Render - " + output_folder + " frame " + str(frame) + " failed (attempt " + str(attempts) + "), queued again: " + error)
+            layer, camera = self.outputs[output_folder]
+            if (layer, frame) in self.render_items[self.position:]:
+                self.cameras_todo[(layer, frame)].append(camera)  # Already queued again for another camera.
+            else:
+                self.cameras_todo[(layer, frame)] = [camera]
+                self.render_items.append((layer, frame))
+            self.retried += 1
+        else:
+            print("[ZOETROPE] Batch Render - " + output_folder + " frame " + str(frame) + " failed " + str(attempts) + " times, giving up: " + error)
+            self.failed[(output_folder, frame)] = error
+            if output_folder in self.encoders: self.encoders[output_folder].add(frame, None)
+
+    def collect_finalise_errors(self):
+        '''
+        Hands frames whose image could not be finalised since the last call to frame_failed.
+        '''
+        errors = self.session.finaliser.errors
+        for (output_folder, frame), error in errors[self._finalise_seen:]:
+            self.frame_failed(output_folder, frame, error.strip().splitlines()[-1])
+        self._finalise_seen = len(errors)
+
+    def step(self):
+        '''
+        Renders the next frame. Returns False once every frame is rendered or failed for good.
+        An exception of a frame never stops the batch, the frame is queued again (see frame_failed).
+        '''
+        if self.done: return False
+        layer, frame = self.render_items[self.position]
+        cameras = self.cameras_todo.pop((layer, frame), self.cameras or [None])
+        self.position += 1
+        try:
+            self.session.switch_layer(layer)
+            if cmds.currentTime(query=True) != frame: cmds.currentTime(frame)
+        except Exception:
+            error = traceback.format_exc().strip().splitlines()[-1]
+            for camera in cameras: self.frame_failed(self.output_folder(layer, camera), frame, error)
+            cameras = []
+        for camera in cameras:
+            output_folder = self.output_folder(layer, camera)
+            start = time.time()
+            try:
+                self.session.render(self.width, self.height, frame, layer, on_finalised = self.on_finalised, output_folder = output_folder, camera = camera or "render_cam")
+                self.telemetry.record_frame(output_folder, frame, time.time() - start)
+            except Exception:
+                self.frame_failed(output_folder, frame, traceback.format_exc().strip().splitlines()[-1])
+        self.collect_finalise_errors()
+        if self.done:
+            # The last frames may still be finalising, their failures get another go as well.
+            self.session.wait()
+            self.collect_finalise_errors()
+        update_status_line(self.status_bar, self.telemetry.status_text())
+        return not self.done
+
+    def progress(self):
+        '''
+        Returns {"done", "total", "layer", "layer_done", "layer_total", "frame", "seconds_per_frame", "eta"} of the next frame.
+        '''
+        index = min(self.position, len(self.render_items) - 1)
+        layer, frame = self.render_items[index] if self.render_items else (None, None)
+        layer_items = [item_layer for item_layer, item_frame in self.render_items if item_layer == layer]
+        layer_done = len([item_layer for item_layer, item_frame in self.render_items[:self.position] if item_layer == layer])
+        rendered = self.telemetry.rendered_frames
+        return {"done": self.position, "total": len(self.render_items), "layer": layer, "layer_done": layer_done, "layer_total": len(layer_items),
+                "frame": frame, "seconds_per_frame": (time.time() - self.telemetry.started) / rendered if rendered else None, "eta": self.telemetry.eta_seconds()}
+
+    def finish(self, cancelled = False):
+        '''
+        Restores the scene and wraps up the batch. Shows the exit message and returns it.
+        '''
+        end_status_line(self.status_bar)
+        session = self.session
+        session.__exit__(None, None, None)
+        for (output_folder, frame), error in session.finalise_errors[self._finalise_seen:]:  # Cancelled before they could be retried.
+            self.failed[(output_folder, frame)] = error.strip().splitlines()[-1]
+        linked = link_static_frames(self.holds, self.output_folders(), self.target_format, "", self.manifest, self.fingerprints)
+        self.manifest.flush()
+        stream_errors = [encoder.video_path + ": " + encoder.error for encoder in self.encoders.values() if not encoder.close()]
+        report_path = self.telemetry.write_report(get_renders_folder())
+        print("[ZOETROPE] Batch Render - Wrote render report to " + report_path + " .")
+        record_render_history(self.telemetry, self.width, self.height, self.target_format)
+
+        # Drafts are for watching, encode them right away. So are streams of formats that could not be streamed.
+        if (self.draft or self.stream) and not self.encoders and not cancelled:
+            encode_sequence_folders([get_renders_folder() + "/" + output_folder + "/" for output_folder in self.output_folders()], targetFormat = "mp4")
+
+        # Exit message.
+        if cancelled:
+            msg = 'Task cancelled after ' + str(self.position) + ' of ' + str(len(self.render_items)) + ' frames. Resume Last Batch renders the rest.\n' + self.order_summary
+        elif self.failed:
+            msg = 'Task finished, but ' + str(len(self.failed)) + ' frames failed ' + str(MAX_FRAME_ATTEMPTS) + ' times. Resume Last Batch renders them again.\n' + self.order_summary
+        else:
+            msg = 'Task finished. Successfully rendered all requested layers into target directory.\n' + self.order_summary
+        msg += '\nRendered ' + str(self.telemetry.rendered_frames) + ' frames in ' + animkit_zoetrope_telemetry.format_duration(time.time() - self.telemetry.started) + ', see render_report.json.'
+        if self.tx_summary: msg += '\n' + self.tx_summary
+        if self.skipped: msg += '\nSkipped ' + str(self.skipped) + ' frames that were already rendered and have not changed.'
+        if linked: msg += '\nLinked ' + str(linked) + ' static frames to the image of the frame they hold.'
+        if session.mover is not None: msg += '\nMoved ' + str(session.mover.moved) + ' frames from ' + session.scratch_folder + ' into /renders.'
+        if self.encoders: msg += '\nStreamed ' + str(len(self.encoders) - len(stream_errors)) + ' of ' + str(len(self.encoders)) + ' layers into videos.'
+        if stream_errors: msg += '\nCould not stream: ' + ", ".join(stream_errors)
+        if self.retried: msg += '\nRendered ' + str(self.retried) + ' failed frames again.'
+        if self.failed:
+            msg += '\nFailed frames:'
+            failed = sorted(self.failed.items())
+            for (output_folder, frame), error in failed[:FAILED_FRAMES_SHOWN]:
+                msg += '\n    ' + str(output_folder) + ' ' + str(frame) + ': ' + error
+            if len(failed) > FAILED_FRAMES_SHOWN: msg += '\n    ... and ' + str(len(failed) - FAILED_FRAMES_SHOWN) + ' more, see the Script Editor.'
+        if cmds.about(batch=True):
+            print("[ZOETROPE] Batch Render - " + msg)
+            return msg
+        cmds.confirmDialog(title='Animkit Zoetrope: Task Cancelled.' if cancelled else 'Animkit Zoetrope: Task Finished.',
+        message=msg,
+        button=['I got it!'], defaultButton='I got it!', dismissString='I got it!')
+        return msg
+
+def batch_render(renderStart, renderEnd, width = get_resolution_settings("width"), height = get_resolution_settings("height"), target_format = "tif", useDefaultRenderLayer = False, resume = False, order = "auto", progressive = False, draft = False, skip_static = False, changed_only = False, stream = False, tx_preflight = True, scratch = False, cameras = None):
     '''
     Calls render_frame and perform batch rendering.
+    Runs as a BatchRenderJob in a progress window (see animkit_zoetrope_jobs) that can pause after the current frame or
+    cancel the batch, Maya stays usable between frames. Returns the JobController, or None without a UI, where the batch
+    renders right away.
+    Every finished frame is recorded in /renders/zoetrope_manifest.json. With resume = True, frames recorded
+    there whose image is still intact are skipped.
+    order is "layer" (every frame of a layer, then the next layer), "frame" (every layer of a frame, then the next frame)
+    or "auto" to measure which one is cheaper for this scene.
+    With progressive = True frames render coarse to fine (see progressive_frame_order), every layer of a frame together
+    unless another order is requested, so a stepped preview of the whole shot exists early on.
+    With draft = True frames render at DRAFT_RESOLUTION_SCALE with capped sampling into /renders/<layer>_draft/ and are
+    encoded into a video right after.
+    With skip_static = True a pre-pass fingerprints every frame (see get_frame_fingerprints). Only the first frame of a run
+    of identical frames is rendered, the others get a hard link or copy of its image.
+    Both record every frame with its fingerprint. With changed_only = True only frames whose fingerprint differs from the
+    one recorded at their last render (frames rendered without one count as changed), or whose image is missing or
+    damaged, are rendered again.
+    With stream = True every finished frame is piped into a running ffmpeg per layer (see animkit_zoetrope_stream),
+    so /renders/<layer>/<scene>.mp4 is done right after the last frame. TIFF and EXR cannot be streamed, their layers
+    are encoded once the batch is done.
+    With tx_preflight = True the textures are converted to .tx first (see preflight_textures) and Arnold renders with them.
+    target_format is an image format, a codec of animkit_zoetrope_codecs.CODECS or "auto" (see resolve_target_format).
+    With scratch = True frames render to a local folder (see get_scratch_folder) and are moved into /renders in batches.
+    With a list of cameras every frame renders through each of them into /renders/<layer>/<camera>/, back to back while
+    the scene is at that frame. Without, frames render through render_cam into /renders/<layer>/.
     '''
     # ====================================== Prompt user to check render range. ======================================
-    msg = "Will render from frame " + str(renderStart) + " to frame " + str(renderEnd) + ". Are you sure?"
-    prompt_start = cmds.confirmDialog( title='Confirm Render', message=msg, button=['Yes','No'], defaultButton='Yes', cancelButton='No', dismissString='No' )
-    
-    # ====================================== Make sure render settings are correct. ======================================
-    toggle_render_settings()
+    suffix = DRAFT_FOLDER_SUFFIX if draft else ""
+    expected_size = get_draft_resolution(width, height) if draft else (width, height)
+    shown_format = "auto (the codec benchmark picks the format when the batch starts)" if target_format == "auto" else target_format
+    msg = "Will render " + shown_format + " images from frame " + str(renderStart) + " to frame " + str(renderEnd) + ". Are you sure?\n"
+    output_folders = [get_output_folder(layer, suffix, camera) for layer in get_render_layers(useDefaultRenderLayer) for camera in cameras or [None]]
+    if cameras: msg += "Every frame renders through " + ", ".join(camera.split("|")[-1] for camera in cameras) + ".\n"
+    msg += predict_batch_time(output_folders, renderEnd - renderStart + 1, expected_size[0], expected_size[1])
+    if cmds.about(batch=True):  # Nobody to ask without the UI.
+        print("[ZOETROPE] Batch Render - " + msg)
+        prompt_start = "Yes"
+    else:
+        prompt_start = cmds.confirmDialog( title='Confirm Render', message=msg, button=['Yes','No'], defaultButton='Yes', cancelButton='No', dismissString='No' )
     
     # ====================================== Actual Batch Render ======================================
     if prompt_start != "No":
-        # Get list of render layers.
-        render_layers = {cmds.getAttr( i + ".displayOrder") : i for i in cmds.ls(type='renderLayer')}
-        render_layers.pop(0)  # Gets rid of "defaultRenderLayer"
+        job = BatchRenderJob(renderStart, renderEnd, width, height, target_format, useDefaultRenderLayer, resume, order, progressive, draft, skip_static, changed_only, stream, tx_preflight, scratch, cameras)
+        if cmds.about(batch=True):
+            job.start()
+            try:
+                while job.step(): pass
+            finally:
+                job.finish(cancelled = not job.done)
+            return None
+
+        import animkit_zoetrope_jobs
+        return animkit_zoetrope_jobs.run_job(job, "Zoetrope Batch Render")
+
+def resume_last_batch():
+    '''
+    Runs the last batch recorded in /renders/zoetrope_manifest.json again, skipping the frames it already finished.
+    '''
+    batch = animkit_zoetrope_manifest.RenderManifest(get_renders_folder()).batch
+    if not batch:
+        cmds.confirmDialog(title='Animkit Zoetrope: Nothing to Resume.', message='No batch has been recorded in ' + get_renders_folder() + ' yet.',
+                           button=['I got it!'], defaultButton='I got it!', dismissString='I got it!')
+        return
+
+    batch_render(renderStart = batch["renderStart"], renderEnd = batch["renderEnd"], width = batch["width"], height = batch["height"],
+                 target_format = batch["target_format"], useDefaultRenderLayer = batch["useDefaultRenderLayer"], resume = True, draft = batch.get("draft", False),
+                 skip_static = batch.get("skip_static", False), scratch = batch.get("scratch", False), cameras = batch.get("cameras"))
 
-        # Set only layer to default current layer.
-        if useDefaultRenderLayer: render_layers = {0: "defaultRenderLayer"}
 
-        # Batch Render.
-        for index in render_layers:
-            layer = render_layers[index]
-            print("[ZOETROPE] Batch Render - Current Render Layer: " + str(layer))
+# =================================================== Zoetrope Worker Pool ===================================================
+def save_scene_snapshot(snapshot_folder = None):
+    '''
+    Saves a copy of the current scene into /renders/zoetrope_snapshot/ (or snapshot_folder) for the headless workers.
+    The open scene keeps its name, file type and unsaved state.
+    '''
+    scene = sceneName()
+    file_type = cmds.file(query=True, type=True)  # Saving as mayaAscii changes it, a .mb would be saved as ASCII next.
+    snapshot_folder = snapshot_folder or get_renders_folder() + "/zoetrope_snapshot"
+    if not os.path.exists(snapshot_folder):
+        os.makedirs(snapshot_folder)
+    snapshot = snapshot_folder + "/" + os.path.basename(scene).split('.')[0] + "_snapshot.ma"
+
+    modified = cmds.file(query=True, modified=True)
+    try:
+        cmds.file(rename=snapshot)
+        cmds.file(save=True, type="mayaAscii", force=True)
+    finally:
+        cmds.file(rename=scene)
+        if file_type: cmds.file(type=file_type[0])
+        cmds.file(modified=modified)
+    print("[Zoetrope] Worker Pool - Saved scene snapshot to " + snapshot + " .")
+    return snapshot
+
+def batch_render_workers(renderStart, renderEnd, width = get_resolution_settings("width"), height = get_resolution_settings("height"), target_format = "tif", useDefaultRenderLayer = False, workers = None, launcher = None):
+    '''
+    Same as batch_render, but hands the (layer, frame) pairs to headless mayapy workers rendering in parallel.
+    Returns the running WorkerPool. The Maya session stays usable while the workers render.
+    launcher(index) returns the argv of one worker, see animkit_zoetrope_pool.WorkerPool.
+    '''
+    # ====================================== Prompt user to check render range. ======================================
+    msg = "Will render from frame " + str(renderStart) + " to frame " + str(renderEnd) + " in background workers. Are you sure?"
+    prompt_start = cmds.confirmDialog( title='Confirm Render', message=msg, button=['Yes','No'], defaultButton='Yes', cancelButton='No', dismissString='No' )
+    if prompt_start == "No": return None
+
+    # ====================================== Snapshot the scene, the workers apply the render settings themselves. ======================================
+    snapshot = save_scene_snapshot()
+
+    # ====================================== Hand out work items. ======================================
+    import multiprocessing
+    workers = workers or animkit_zoetrope_pool.default_worker_count()
+    threads = max(1, multiprocessing.cpu_count() // workers)
+    render_layers = get_render_layers(useDefaultRenderLayer)
+    items = [{"layer": layer, "frame": frame, "width": width, "height": height, "format": target_format, "threads": threads}
+             for layer in render_layers for frame in range(renderStart, renderEnd + 1)]
+
+    manifest = animkit_zoetrope_manifest.RenderManifest(get_renders_folder())
+    manifest.start_batch(render_layers, renderStart = renderStart, renderEnd = renderEnd, width = width, height = height,
+                         target_format = target_format, useDefaultRenderLayer = useDefaultRenderLayer)
+
+    if launcher is None: launcher = animkit_zoetrope_pool.mayapy_launcher(snapshot, str(sceneName()))
+    governor = animkit_zoetrope_resources.ResourceGovernor(workers)
+    pool = animkit_zoetrope_pool.WorkerPool(launcher, workers, on_result = lambda result: record_result(manifest, result), governor = governor)
+
+    thread = threading.Thread(target=_run_worker_pool, args=(pool, items, get_renders_folder(), manifest))
+    thread.daemon = True
+    thread.start()
+    print("[Zoetrope] Worker Pool - Rendering " + str(len(items)) + " frames with " + str(workers) + " workers.")
+    return pool
+
+def _run_worker_pool(pool, items, renders_folder, manifest):
+    '''
+    HELPER for batch_render_workers(). Runs on a background thread and reports back on the main thread.
+    '''
+    results = pool.run(items)
+    manifest.flush()
+    report_background_results(results, len(items), renders_folder)
+
+def _join_command_pool(pool, total, renders_folder, manifest):
+    '''
+    HELPER for batch_render_kick(). Runs on a background thread and reports back on the main thread.
+    '''
+    results = pool.join()
+    manifest.flush()
+    report_background_results(results, total, renders_folder)
+
+def record_result(manifest, result):
+    '''
+    Records a finished background render in the manifest. Results carry the image path in "path".
+    '''
+    if result["ok"] and os.path.isfile(result["path"]):
+        manifest.record(result["layer"], result["frame"], result["path"])
+    elif result["ok"]:
+        print("[Zoetrope] Background Render - " + str(result["layer"]) + " frame " + str(result["frame"]) + " reported done but left no image at " + result["path"] + " .")
+
+def report_background_results(results, total, renders_folder):
+    '''
+    Writes the render report of a background batch into renders_folder and shows its exit message on the main thread.
+    Safe to call from any thread.
+    '''
+    telemetry = animkit_zoetrope_telemetry.RenderTelemetry(total)
+    for result in results:
+        if not result["ok"]: continue
+        telemetry.record_frame(result["layer"], result["frame"], result["seconds"], result.get("peak_rss", 0), result.get("rss", 0))
+        if os.path.isfile(result["path"]): telemetry.record_output(result["layer"], result["frame"], os.path.getsize(result["path"]))
+    telemetry.write_report(renders_folder)
+
+    failed = [result for result in results if not result["ok"]]
+    msg = 'Task finished. Rendered ' + str(len(results) - len(failed)) + ' of ' + str(total) + ' frames into target directory.'
+    if failed:
+        msg += '\nFailed: ' + ", ".join(str(result["layer"]) + " " + str(result["frame"]) for result in failed)
+        for result in failed: print("[Zoetrope] Background Render - " + str(result["layer"]) + " frame " + str(result["frame"]) + " failed:\n" + result["error"])
+
+    maya.utils.executeDeferred(cmds.confirmDialog, title='Animkit Zoetrope: Task Finished.', message=msg,
+                               button=['I got it!'], defaultButton='I got it!', dismissString='I got it!')
+
+
+# =================================================== Zoetrope Work Queue ===================================================
+# Several workstations render one batch through /renders/zoetrope_queue/, see animkit_zoetrope_queue.
+# Every machine has to mount the project under the same path.
+def get_queue_folder():
+    return get_renders_folder() + "/" + animkit_zoetrope_queue.QUEUE_FOLDER
+
+def publish_render_queue(renderStart, renderEnd, width = get_resolution_settings("width"), height = get_resolution_settings("height"), target_format = "tif", useDefaultRenderLayer = False):
+    '''
+    Snapshots the scene into the work queue and publishes one task per (layer, frame).
+    Nothing renders until workers join, from this or any other workstation (join_render_queue).
+    '''
+    msg = "Will publish frame " + str(renderStart) + " to frame " + str(renderEnd) + " to the shared render queue. Are you sure?"
+    prompt_start = cmds.confirmDialog( title='Confirm Render', message=msg, button=['Yes','No'], defaultButton='Yes', cancelButton='No', dismissString='No' )
+    if prompt_start == "No": return None
+
+    queue_folder = get_queue_folder()
+    snapshot = save_scene_snapshot(queue_folder)
+    items = [{"layer": layer, "frame": frame, "width": width, "height": height, "format": target_format}
+             for layer in get_render_layers(useDefaultRenderLayer) for frame in range(renderStart, renderEnd + 1)]
+    work_queue = animkit_zoetrope_queue.WorkQueue(queue_folder)
+    work_queue.publish(items, snapshot = snapshot, scene = str(sceneName()))
+
+    cmds.confirmDialog(title='Animkit Zoetrope: Queue Published.',
+    message='Published ' + str(len(items)) + ' frames to ' + queue_folder + ' .\nOpen this scene on every workstation that should help and join the queue.',
+    button=['I got it!'], defaultButton='I got it!', dismissString='I got it!')
+    return work_queue
+
+def join_render_queue(workers = None, launcher = None):
+    '''
+    Starts headless workers on this workstation that render tasks of the work queue until it is empty.
+    launcher(index) returns the argv of one worker, see animkit_zoetrope_pool.queue_launcher.
+    '''
+    queue_folder = get_queue_folder()
+    if not os.path.isfile(queue_folder + "/" + animkit_zoetrope_queue.BATCH_NAME):
+        cmds.confirmDialog(title='Animkit Zoetrope: Nothing to Join.', message='No render queue has been published in ' + get_renders_folder() + ' yet.',
+                           button=['I got it!'], defaultButton='I got it!', dismissString='I got it!')
+        return None
+
+    import multiprocessing
+    workers = workers or animkit_zoetrope_pool.default_worker_count()
+    if launcher is None: launcher = animkit_zoetrope_pool.queue_launcher(queue_folder, max(1, multiprocessing.cpu_count() // workers))
+    procs = [subprocess.Popen(launcher(index), creationflags = animkit_zoetrope_pool.creation_flags()) for index in range(workers)]
+
+    thread = threading.Thread(target=_wait_render_queue, args=(procs, queue_folder))
+    thread.daemon = True
+    thread.start()
+    print("[Zoetrope] Work Queue - Joined " + queue_folder + " with " + str(workers) + " workers.")
+    return procs
+
+def _wait_render_queue(procs, queue_folder):
+    '''
+    HELPER for join_render_queue(). Runs on a background thread and reports back on the main thread.
+    '''
+    for proc in procs:
+        proc.wait()
+    maya.utils.executeDeferred(show_render_queue_status, queue_folder)
+
+def show_render_queue_status(queue_folder = None):
+    '''
+    Shows how far the work queue is, and which frames failed.
+    '''
+    work_queue = animkit_zoetrope_queue.WorkQueue(queue_folder or get_queue_folder())
+    status = work_queue.status()
+    msg = str(status["done"]) + ' frames done, ' + str(status["claimed"]) + ' rendering, ' + str(status["todo"]) + ' waiting, ' + str(status["failed"]) + ' failed.'
+    failed = work_queue.results("failed")
+    if failed: msg += '\nFailed: ' + ", ".join(str(result["layer"]) + " " + str(result["frame"]) + " (" + str(result.get("worker")) + ")" for result in failed)
+    cmds.confirmDialog(title='Animkit Zoetrope: Render Queue.', message=msg, button=['I got it!'], defaultButton='I got it!', dismissString='I got it!')
+
+
+# =================================================== Zoetrope Tiled Render ===================================================
+# Hero stills at print resolution render as tiles in parallel workers, see animkit_zoetrope_tiles.
+TILE_FOLDER = ZOETROPE_FOLDER_PREFIX + "tiles"
+
+def render_tiled_frame(frame, file_format = "tif", render_layer = None, tiles = None, workers = None, launcher = None):
+    '''
+    Renders one frame as tiles (render regions) in headless mayapy workers and stitches them into /renders/render_layer/
+    in the background. tiles defaults to one tile per worker. Returns the running WorkerPool.
+    launcher(index) returns the argv of one worker, see animkit_zoetrope_pool.WorkerPool.
+    '''
+    import multiprocessing
+    frame = int(frame)
+    render_layer = render_layer or cmds.editRenderLayerGlobals(query=True, currentRenderLayer=True)
+    width, height = get_resolution_settings("width"), get_resolution_settings("height")
+    workers = workers or animkit_zoetrope_pool.default_worker_count()
+    tile_layout = animkit_zoetrope_tiles.split_tiles(width, height, tiles or workers)
+    workers = min(workers, len(tile_layout))
+
+    snapshot = save_scene_snapshot()
+    threads = max(1, multiprocessing.cpu_count() // workers)
+    items = [{"layer": render_layer, "frame": frame, "width": width, "height": height, "format": file_format, "threads": threads, "tile": tile["index"],
+              "region": list(animkit_zoetrope_tiles.maya_region(tile, height)), "output_folder": TILE_FOLDER + "/" + render_layer + "_tile" + str(tile["index"])}
+             for tile in tile_layout]
+
+    if launcher is None: launcher = animkit_zoetrope_pool.mayapy_launcher(snapshot, str(sceneName()))
+    # Every worker renders one tile, probing with the first would hold the others back for a whole tile. Each loads the
+    # same scene as this session, so its memory is the estimate they all start from.
+    governor = animkit_zoetrope_resources.ResourceGovernor(workers, probe_first = False, peak_bytes = animkit_zoetrope_telemetry.rss_bytes())
+    pool = animkit_zoetrope_pool.WorkerPool(launcher, workers, governor = governor)
+    thread = threading.Thread(target=_run_tiled_frame, args=(pool, items, tile_layout, width, height, get_frame_path(frame, file_format, render_layer)))
+    thread.daemon = True
+    thread.start()
+    print("[Zoetrope] Tiled Render - Rendering frame " + str(frame) + " as " + str(len(tile_layout)) + " tiles with " + str(workers) + " workers.")
+    return pool
+
+def _run_tiled_frame(pool, items, tile_layout, width, height, output_path):
+    '''
+    HELPER for render_tiled_frame(). Runs on a background thread and reports back on the main thread.
+    '''
+    start = time.time()
+    results = pool.run(items)
+    failed = [result for result in results if not result["ok"]]
+    if failed:
+        msg = 'Could not render tiles ' + ", ".join(str(result["tile"]) for result in failed) + ', nothing was stitched.'
+        for result in failed: print("[Zoetrope] Tiled Render - Tile " + str(result["tile"]) + " failed:\n" + result["error"])
+    else:
+        try:
+            tile_paths = dict((result["tile"], result["path"]) for result in results)
+            animkit_zoetrope_tiles.stitch_tiles(tile_layout, tile_paths, width, height, output_path)
+            for tile_path in tile_paths.values(): os.remove(tile_path)
+            msg = 'Task finished. Rendered ' + str(len(tile_layout)) + ' tiles in ' + animkit_zoetrope_telemetry.format_duration(time.time() - start) + ' into ' + output_path + ' .'
+        except Exception as e:
+            msg = 'Rendered every tile, but could not stitch them: ' + str(e)
+
+    maya.utils.executeDeferred(cmds.confirmDialog, title='Animkit Zoetrope: Task Finished.', message=msg,
+                               button=['I got it!'], defaultButton='I got it!', dismissString='I got it!')
+
+
+# =================================================== Zoetrope Kick Pipeline ===================================================
+def export_ass(ass_path, layer, camera = "render_cam"):
+    '''
+    HELPER for batch_render_kick().
+    Exports the current frame of the given render layer into an Arnold scene description.
+    '''
+    switch_render_layer(layer)
+    cmds.arnoldExportAss(filename=ass_path, cam=camera)
+
+def batch_render_kick(renderStart, renderEnd, width = get_resolution_settings("width"), height = get_resolution_settings("height"), target_format = "tif", useDefaultRenderLayer = False, max_procs = None, kick_command = None):
+    '''
+    Two stage batch render. Maya exports one .ass file per layer and frame into /renders/zoetrope_ass/,
+    and each file is rendered by a standalone kick process as soon as it is written, at most max_procs at a time.
+    kick_command(ass_path, image_path, width, height) returns the argv of one render, see animkit_zoetrope_pool.kick_command.
+    '''
+    # ====================================== Prompt user to check render range. ======================================
+    msg = "Will export and kick render from frame " + str(renderStart) + " to frame " + str(renderEnd) + ". Are you sure?"
+    prompt_start = cmds.confirmDialog( title='Confirm Render', message=msg, button=['Yes','No'], defaultButton='Yes', cancelButton='No', dismissString='No' )
+    if prompt_start == "No": return None
+
+    import multiprocessing
+    max_procs = max_procs or animkit_zoetrope_pool.default_worker_count()
+    if kick_command is None: kick_command = animkit_zoetrope_pool.kick_command(threads = max(1, multiprocessing.cpu_count() // max_procs))
+    render_layers = get_render_layers(useDefaultRenderLayer)
+    manifest = animkit_zoetrope_manifest.RenderManifest(get_renders_folder())
+    manifest.start_batch(render_layers, renderStart = renderStart, renderEnd = renderEnd, width = width, height = height,
+                         target_format = target_format, useDefaultRenderLayer = useDefaultRenderLayer)
+    # kick does not report its memory, the governor only holds launches back while memory is short.
+    governor = animkit_zoetrope_resources.ResourceGovernor(max_procs, probe_first = False)
+    pool = animkit_zoetrope_pool.CommandPool(max_procs, on_result = lambda result: record_result(manifest, result), governor = governor)
+
+    total = 0
+
+    # ====================================== Stage 1: Export, each frame is kicked off right away. ======================================
+    with RenderSession(target_format) as session:
+        session.use_camera("render_cam")
+        for layer in render_layers:
+            print("[ZOETROPE] Kick Render - Exporting Render Layer: " + str(layer))
+            ass_dir = get_renders_folder() + "/zoetrope_ass/" + layer
+            image_dir = get_renders_folder() + "/" + layer
+            for folder in [ass_dir, image_dir]:
+                if not os.path.exists(folder): os.makedirs(folder)
+
             for frame in range(renderStart, renderEnd + 1):
                 cmds.currentTime(frame)
-                render_frame(width, height, frame, target_format, layer)
-
-        # Exit message.
-        cmds.confirmDialog(title='Animkit Zoetrope: Task Finished.', 
-        message='Task finished. Successfully rendered all requested layers into target directory.', 
-        button=['I got it!'], defaultButton='I got it!', dismissString='I got it!')
+                image_path = get_frame_path(frame, target_format, layer)
+                ass_path = ass_dir + "/" + os.path.splitext(os.path.basename(image_path))[0] + ".ass"
+                export_ass(ass_path, layer)
+                if os.path.exists(image_path): os.remove(image_path)  # kick writes in place, it could be a hard link of a held frame.
+                pool.submit(kick_command(ass_path, image_path, width, height), {"layer": layer, "frame": frame, "path": image_path})
+                total += 1
+
+    # ====================================== Stage 2: Let kick finish in the background. ======================================
+    renders_folder = get_renders_folder()
+    thread = threading.Thread(target=_join_command_pool, args=(pool, total, renders_folder, manifest))
+    thread.daemon = True
+    thread.start()
+    print("[Zoetrope] Kick Render - Exported " + str(total) + " frames, kick is rendering them with " + str(max_procs) + " processes.")
+    return pool
 
 
 # =================================================== Zoetrope Formatter ===================================================
@@ -227,135 +1387,204 @@ def padding_format(number, padding):
     
 
 # =================================================== Zoetrope Video Encoder ===================================================
-def take_off_zero(input_str):
-    """
-    Takes off zero from the start of a string.
-    Example: "0-10" -> "-10"
-    """
-
-    temp_str = input_str
-    while temp_str[0] == "0":
-        temp_str = temp_str[1:]
-        if temp_str == "": return "0"  # Handle case when padding is 0000.
-
-    return temp_str
-
-def is_image(image_ext):
-    if image_ext in ["jpg", "jpeg", "png", "tiff", "tif", "exr"]:
-        return True
-    else:
-        return False
-
-def get_start_end_frames(file_path, padding):
-    """
-    A function that takes in a folder and padding, figures out the start frame and end frame.
-    """
-
-    file_name_with_ext = [f for f in listdir(file_path) if isfile(join(file_path, f))]
-    padding_list = []
-
-    for file_name_ext in file_name_with_ext:
-        # Get file name.
-        (file_name, ext) = os.path.splitext(file_name_ext)
-        
-        # Only include image files.
-        if is_image(ext.replace('.', '') ):
-            # Get last padding amount of character from the back of the file name.
-            padding_str = file_name[-padding:]  
-
-            # Convert padding to int, add it to the padding list
-            padding_list.append(int(take_off_zero(padding_str)))
-    
-    return [min(padding_list), max(padding_list)]
-
+# Every encoder finds its frames through one SequenceIndex, a folder is only scanned again after it changed.
+SEQUENCE_INDEX = animkit_zoetrope_sequences.SequenceIndex()
 
-def video_encoder(seq_folder, renders_prefix, image_format, target_format, frame_rate = get_frame_rate(), frame_padding = get_padding()):
+def find_render_sequence(seq_folder, renders_prefix, image_format = None):
     '''
-    Encodes image sequence into respective file format.
+    Returns the image Sequence renders_prefix_####.image_format of seq_folder (any image format if None), or None.
     '''
+    return SEQUENCE_INDEX.find(seq_folder, renders_prefix + "_", image_format)
 
-    # Define constants
-    frameStart = get_start_end_frames(seq_folder, frame_padding)[0]
-    frameEnd = get_start_end_frames(seq_folder, frame_padding)[1]
 
-    # Create temp folder
-    temp_folder = seq_folder + "temp\\"
-    if os.path.exists(temp_folder):
-        shutil.rmtree(temp_folder)
-    os.makedirs(temp_folder)
-    print("[Zoetrope] Video Encoder - Successfully copied and renamed all images into a temporary folder at " + temp_folder + " .")
+def video_encoder_command(seq_folder, renders_prefix, image_format, target_format, frame_rate = get_frame_rate(), threads = None):
+    '''
+    HELPER for video_encoder() and encode_sequence_folders().
+    Writes the concat list of the sequence and returns (ffmpeg argv, list path, video path), or None without a sequence.
+    ffmpeg reads the frames where they are, in frame order, negative frames first. Missing frames hold the frame before them.
+    '''
+    frame_rate = frame_rate or 24
+    sequence = find_render_sequence(seq_folder, renders_prefix, image_format)
+    if sequence is None:
+        print("[Zoetrope] Video Encoder - No " + image_format + " sequence of " + renders_prefix + " at: " + seq_folder)
+        return None
+    if sequence.gaps: print("[Zoetrope] Video Encoder - Missing frames hold the frame before them: " + str(sequence.gaps))
+
+    # One entry per rendered frame, on screen until the next rendered one.
+    entries = []
+    for frame in make_num_list(sequence.start, sequence.end):
+        if frame in sequence.files:
+            entries.append([sequence.path(frame), 1.0 / frame_rate])
+        else:
+            entries[-1][1] += 1.0 / frame_rate
+    list_path = seq_folder + "zoetrope_encode.txt"
+    write_concat_list(list_path, entries)
+    video_path = seq_folder + renders_prefix + "." + target_format
 
-    # Make sequence list
-    sequence_list = make_num_list(frameStart, frameEnd)
-    for index, value in enumerate(sequence_list):
-        sequence_list[index] = renders_prefix + "_" + padding_format(value, frame_padding) + "." + image_format
-        
-    # Copying everything into a new temp folder
-    counter = 0
-    for index, value in enumerate(sequence_list):
-        source = seq_folder + value
-        destination = temp_folder + padding_format(counter, frame_padding) + "." + image_format
-        shutil.copyfile(source, destination) 
-        # print("Processing the " + str(counter) + " image.") # Just to see progress
-        counter += 1
-
-    image_sequence_path = temp_folder + "%0"+ str (frame_padding) + "d." + image_format
-    video_path = os.path.dirname(os.path.dirname(temp_folder)) + "\\" + renders_prefix + "." + target_format  # Go up one directory, need to test this code
-
-    print("[Zoetrope] Video Encoder - Image sequence path: " + image_sequence_path)
+    print("[Zoetrope] Video Encoder - Image sequence: " + str(sequence))
     print("[Zoetrope] Video Encoder - Video target path: " + video_path)
+    thread_args = ["-threads", str(threads)] if threads else []
+    # The repeated last entry of the list (see write_concat_list) would be one frame more, the video gets exactly the sequence.
+    frame_count = ["-frames:v", str(sequence.end - sequence.start + 1)]
+    return ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_path, "-r", str(frame_rate)] + frame_count + animkit_zoetrope_stream.VIDEO_ARGS + thread_args + [video_path], list_path, video_path
 
-    if os.path.exists(video_path): 
-        os.remove(video_path)
-        if not os.path.exists(video_path):
-            print("[Zoetrope] Video Encoder - Video exists at: " + video_path + " and got deleted successfully.")
-    
-    subprocess.call(["ffmpeg", "-framerate", "24",  "-i", image_sequence_path, "-c:v", "libx264", "-pix_fmt", "yuv420p", video_path], shell=True) 
+def video_encoder(seq_folder, renders_prefix, image_format, target_format, frame_rate = get_frame_rate()):
+    '''
+    Encodes image sequence into respective file format.
+    '''
+    command = video_encoder_command(seq_folder, renders_prefix, image_format, target_format, frame_rate)
+    if command is None: return
+    argv, list_path, video_path = command
+    subprocess.call(argv, creationflags = animkit_zoetrope_pool.creation_flags())
+    os.remove(list_path)
     
     print("[Zoetrope] Video Encoder - Successfully encoded the image sequence to video of " + target_format + " format.")
 
-    shutil.rmtree(temp_folder)
-    print("[Zoetrope] Video Encoder - Successfully deleted the temporary folder at " + temp_folder + " .")
-
 
-def assemble_sequence_folder(seq_folder, rendersPrefix = os.path.basename(sceneName().split('.')[0]), targetFormat = "mp4"):
+def write_concat_list(list_path, entries):
+    '''
+    Writes an ffmpeg concat demuxer file list. entries is a list of (image path, seconds on screen).
+    '''
+    with open(list_path, "w") as f:
+        f.write("ffconcat version 1.0\n")
+        for image_path, duration in entries:
+            f.write("file '" + image_path.replace('\\', '/').replace("'", "'\\''") + "'\n")
+            f.write("duration " + str(duration) + "\n")
+        # The concat demuxer ignores the duration of the last entry unless the file is repeated.
+        if entries: f.write("file '" + entries[-1][0].replace('\\', '/').replace("'", "'\\''") + "'\n")
+
+def preview_encoder_command(seq_folder, renders_prefix, image_format, frame_rate = get_frame_rate(), threads = None):
+    '''
+    HELPER for preview_encoder() and encode_sequence_folders().
+    Writes the concat list of the preview and returns (ffmpeg argv, list path, video path), or None without rendered frames.
+    '''
+    frame_rate = frame_rate or 24
+    sequence = find_render_sequence(seq_folder, renders_prefix, image_format)
+    if sequence is None:
+        print("[Zoetrope] Preview Encoder - No frames rendered yet at: " + seq_folder)
+        return None
+    batch = animkit_zoetrope_manifest.RenderManifest(get_renders_folder()).batch
+    if batch:
+        frameStart, frameEnd = batch["renderStart"], batch["renderEnd"]
+    else:
+        frameStart, frameEnd = sequence.start, sequence.end
+
+    # Hold every rendered frame across the gap after it, the gap before the first one holds the first one.
+    entries = []
+    leading_frames = 0
+    for frame in make_num_list(frameStart, frameEnd):
+        if frame in sequence.files:
+            entries.append([sequence.path(frame), 1.0 / frame_rate])
+        elif entries:
+            entries[-1][1] += 1.0 / frame_rate
+        else:
+            leading_frames += 1
+    if not entries:
+        print("[Zoetrope] Preview Encoder - No frames rendered yet at: " + seq_folder)
+        return None
+    entries[0][1] += leading_frames * 1.0 / frame_rate
+
+    list_path = seq_folder + "zoetrope_preview.txt"
+    write_concat_list(list_path, entries)
+    video_path = seq_folder + renders_prefix + "_preview.mp4"
+    print("[Zoetrope] Preview Encoder - Encoding " + str(len(entries)) + " rendered frames into a preview at " + video_path + " .")
+    thread_args = ["-threads", str(threads)] if threads else []
+    frame_count = ["-frames:v", str(frameEnd - frameStart + 1)]  # See video_encoder_command().
+    return ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_path, "-r", str(frame_rate)] + frame_count + animkit_zoetrope_stream.VIDEO_ARGS + thread_args + [video_path], list_path, video_path
+
+def preview_encoder(seq_folder, renders_prefix, image_format, frame_rate = get_frame_rate()):
+    '''
+    Encodes whatever frames of a progressive render exist into renders_prefix_preview.mp4, holding each frame until
+    the next rendered one. The frame range is the one of the last batch, or the frames found on disk.
+    '''
+    command = preview_encoder_command(seq_folder, renders_prefix, image_format, frame_rate)
+    if command is None: return
+    argv, list_path, video_path = command
+    subprocess.call(argv, creationflags = animkit_zoetrope_pool.creation_flags())
+    os.remove(list_path)
+    print("[Zoetrope] Preview Encoder - Encoded the preview at " + video_path + " .")
+
+def assemble_sequence_folder(seq_folder, rendersPrefix = os.path.basename(sceneName().split('.')[0]), targetFormat = "mp4", preview = False):
     print("[Zoetrope] Sequence Folder Assembler - Current: " + seq_folder) 
 
-    # Checking if the list is empty or not 
-    if len(os.listdir(seq_folder)) == 0: 
-        print("[Zoetrope] Video Converter - Empty directory at: " + seq_folder) 
-    else: 
-        # Sample a file and get extension of the files in the render folder
-        isPicture = False
-        ext = ""
-
-        while(not isPicture):
-            file_list = [f for f in os.listdir(seq_folder) if os.path.isfile(os.path.join(seq_folder, f))]
-            for counter in range(len(file_list)):
-                ext = os.path.splitext(file_list[counter])[1].replace('.', '') 
-                if is_image(ext): isPicture = True
-
-        if(isPicture):
-            video_encoder(seq_folder = seq_folder, renders_prefix = rendersPrefix, image_format = ext, target_format = targetFormat)
+    # The longest image sequence of the scene decides the image format.
+    sequence = find_render_sequence(seq_folder, rendersPrefix)
+    if sequence is None:
+        print("[Zoetrope] Video Converter - No image found at: " + seq_folder)
+    elif preview:
+        preview_encoder(seq_folder = seq_folder, renders_prefix = rendersPrefix, image_format = sequence.ext)
+    else:
+        video_encoder(seq_folder = seq_folder, renders_prefix = rendersPrefix, image_format = sequence.ext, target_format = targetFormat)
+
+def encode_sequence_folders(seq_folders, targetFormat = "mp4", preview = False, max_procs = None, rendersPrefix = None):
+    '''
+    Encodes the image sequence of every folder like assemble_sequence_folder(), up to max_procs ffmpeg processes at once
+    (one per folder and core by default). Each ffmpeg gets an equal share of the cores through -threads, and a
+    ResourceGovernor holds launches while memory is short.
+    Returns the results (see animkit_zoetrope_pool.CommandPool) with "folder", "video" and "seconds", in folder order.
+    '''
+    import multiprocessing
+    rendersPrefix = rendersPrefix or os.path.basename(sceneName().split('.')[0])
+    cores = multiprocessing.cpu_count()
+    sequences = [(seq_folder, find_render_sequence(seq_folder, rendersPrefix)) for seq_folder in seq_folders]
+    for seq_folder, sequence in sequences:
+        if sequence is None: print("[Zoetrope] Video Converter - No image found at: " + seq_folder)
+    sequences = [(seq_folder, sequence) for seq_folder, sequence in sequences if sequence is not None]
+    if not sequences: return []
+
+    max_procs = max(1, min(len(sequences), max_procs or cores))
+    threads = max(1, cores // max_procs)
+    print("[Zoetrope] Video Converter - Encoding " + str(len(sequences)) + " sequences, " + str(max_procs) + " at a time with " + str(threads) + " threads each.")
+    pool = animkit_zoetrope_pool.CommandPool(max_procs, governor = animkit_zoetrope_resources.ResourceGovernor(max_procs, probe_first = False))
+    for seq_folder, sequence in sequences:
+        if preview:
+            command = preview_encoder_command(seq_folder, rendersPrefix, sequence.ext, threads = threads)
+        else:
+            command = video_encoder_command(seq_folder, rendersPrefix, sequence.ext, targetFormat, threads = threads)
+        if command is None: continue
+        argv, list_path, video_path = command
+        pool.submit(argv, {"folder": seq_folder, "video": video_path, "list": list_path})
+
+    results = sorted(pool.join(), key = lambda result: seq_folders.index(result["folder"]))
+    for result in results:
+        if os.path.exists(result["list"]): os.remove(result["list"])
+        if result["ok"]:
+            print("[Zoetrope] Video Converter - Encoded " + result["video"] + " in " + animkit_zoetrope_telemetry.format_duration(result["seconds"]) + " .")
         else:
-            print("[Zoetrope] Video Converter - No image found at: " + seq_folder)
+            print("[Zoetrope] Video Converter - Could not encode " + result["folder"] + ":\n" + result["error"])
+    return results
 
-def video_converter(targetFormat):
+def video_converter(targetFormat, preview = False):
     '''
     Calls video_encoder and convert all render layers into respective file format. 
+    With preview = True, calls preview_encoder instead to encode the frames a progressive render has finished so far.
+    Every layer (and camera) folder encodes at the same time, see encode_sequence_folders. Shows the time of each and returns the results.
     '''
     scene_path = cmds.file(location=True, query=True) 
     current_dir = sceneName().parent
     
-    list_render_subfolders_with_paths = [x for x in os.listdir(current_dir + "/renders/") if os.path.isdir(current_dir + "/renders/" + x)]
+    list_render_subfolders_with_paths = [x for x in os.listdir(current_dir + "/renders/") if os.path.isdir(current_dir + "/renders/" + x) and not x.startswith(ZOETROPE_FOLDER_PREFIX)]
     print("[Zoetrope] Video Converter - All avaliable render layers: " + str(list_render_subfolders_with_paths))
 
+    seq_folders = []
     for render_layer_folder in list_render_subfolders_with_paths:
-        print("[Zoetrope] Video Converter - Current compositing render layer: " + render_layer_folder)
         current_layer_dir = os.path.dirname(scene_path)
-        seq_folder = current_layer_dir + "/renders/" + render_layer_folder + "/"
-        print("[Zoetrope] Video Converter - Current Sequence Folder: " + seq_folder)
-        assemble_sequence_folder(seq_folder = seq_folder, targetFormat = targetFormat)
+        layer_folder = current_layer_dir + "/renders/" + render_layer_folder + "/"
+
+        # Multi-camera batches render into one folder per camera inside the layer folder.
+        camera_folders = [layer_folder + x + "/" for x in sorted(os.listdir(layer_folder)) if os.path.isdir(layer_folder + x)]
+        has_images = SEQUENCE_INDEX.find(layer_folder) is not None
+        seq_folders += ([layer_folder] if has_images or not camera_folders else []) + camera_folders
+
+    start = time.time()
+    results = encode_sequence_folders(seq_folders, targetFormat = targetFormat, preview = preview)
+    renders_folder = current_dir + "/renders/"
+    msg = "Encoded " + str(len([result for result in results if result["ok"]])) + " of " + str(len(results)) + " sequences in " + animkit_zoetrope_telemetry.format_duration(time.time() - start) + "."
+    for result in results:
+        name = result["folder"].replace('\\', '/').replace(renders_folder.replace('\\', '/'), "").strip("/")
+        msg += "\n" + name + ": " + (animkit_zoetrope_telemetry.format_duration(result["seconds"]) if result["ok"] else "failed, see the Script Editor")
+    cmds.confirmDialog(title='Animkit Zoetrope: Encoding Finished.', message=msg, button=['I got it!'], defaultButton='I got it!', dismissString='I got it!')
+    return results
 
 
 # =================================================== Zoetrope API ===================================================
@@ -376,19 +1605,137 @@ def render_default_nopadding(self):
     TIMELINE = TimelineProperties()
     batch_render(renderStart = int(TIMELINE.INNER_START), renderEnd = int(TIMELINE.INNER_END), useDefaultRenderLayer = True)
 
+def render_w_padding_progressive(self):
+    TIMELINE = TimelineProperties()
+    batch_render(renderStart = int(TIMELINE.START), renderEnd = int(TIMELINE.END), progressive = True)
+
+def render_nopadding_progressive(self):
+    TIMELINE = TimelineProperties()
+    batch_render(renderStart = int(TIMELINE.INNER_START), renderEnd = int(TIMELINE.INNER_END), progressive = True)
+
+def render_w_padding_draft(self):
+    TIMELINE = TimelineProperties()
+    batch_render(renderStart = int(TIMELINE.START), renderEnd = int(TIMELINE.END), draft = True)
+
+def render_nopadding_draft(self):
+    TIMELINE = TimelineProperties()
+    batch_render(renderStart = int(TIMELINE.INNER_START), renderEnd = int(TIMELINE.INNER_END), draft = True)
+
+def render_w_padding_skip_static(self):
+    TIMELINE = TimelineProperties()
+    batch_render(renderStart = int(TIMELINE.START), renderEnd = int(TIMELINE.END), skip_static = True)
+
+def render_nopadding_skip_static(self):
+    TIMELINE = TimelineProperties()
+    batch_render(renderStart = int(TIMELINE.INNER_START), renderEnd = int(TIMELINE.INNER_END), skip_static = True)
+
+def render_w_padding_changed(self):
+    TIMELINE = TimelineProperties()
+    batch_render(renderStart = int(TIMELINE.START), renderEnd = int(TIMELINE.END), skip_static = True, changed_only = True)
+
+def render_nopadding_changed(self):
+    TIMELINE = TimelineProperties()
+    batch_render(renderStart = int(TIMELINE.INNER_START), renderEnd = int(TIMELINE.INNER_END), skip_static = True, changed_only = True)
+
+def render_w_padding_stream(self):
+    TIMELINE = TimelineProperties()
+    batch_render(renderStart = int(TIMELINE.START), renderEnd = int(TIMELINE.END), target_format = "png", stream = True)
+
+def render_nopadding_stream(self):
+    TIMELINE = TimelineProperties()
+    batch_render(renderStart = int(TIMELINE.INNER_START), renderEnd = int(TIMELINE.INNER_END), stream = True)
+
+def render_w_padding_scratch(self):
+    TIMELINE = TimelineProperties()
+    batch_render(renderStart = int(TIMELINE.START), renderEnd = int(TIMELINE.END), scratch = True)
+
+def render_nopadding_scratch(self):
+    TIMELINE = TimelineProperties()
+    batch_render(renderStart = int(TIMELINE.INNER_START), renderEnd = int(TIMELINE.INNER_END), scratch = True)
+
+def render_w_padding_selected_cameras(self):
+    TIMELINE = TimelineProperties()
+    cameras = get_selected_cameras()
+    if not cameras: raise Exception("[ZOETROPE] ERROR: render_w_padding_selected_cameras() - Select the cameras to render first!!!")
+    batch_render(renderStart = int(TIMELINE.START), renderEnd = int(TIMELINE.END), cameras = cameras)
+
+def render_nopadding_selected_cameras(self):
+    TIMELINE = TimelineProperties()
+    cameras = get_selected_cameras()
+    if not cameras: raise Exception("[ZOETROPE] ERROR: render_nopadding_selected_cameras() - Select the cameras to render first!!!")
+    batch_render(renderStart = int(TIMELINE.INNER_START), renderEnd = int(TIMELINE.INNER_END), cameras = cameras)
+
+def render_w_padding_workers(self):
+    TIMELINE = TimelineProperties()
+    batch_render_workers(renderStart = int(TIMELINE.START), renderEnd = int(TIMELINE.END))
+
+def render_nopadding_workers(self):
+    TIMELINE = TimelineProperties()
+    batch_render_workers(renderStart = int(TIMELINE.INNER_START), renderEnd = int(TIMELINE.INNER_END))
+
+def render_w_padding_kick(self):
+    TIMELINE = TimelineProperties()
+    batch_render_kick(renderStart = int(TIMELINE.START), renderEnd = int(TIMELINE.END))
+
+def render_nopadding_kick(self):
+    TIMELINE = TimelineProperties()
+    batch_render_kick(renderStart = int(TIMELINE.INNER_START), renderEnd = int(TIMELINE.INNER_END))
+
+def publish_queue_w_padding(self):
+    TIMELINE = TimelineProperties()
+    publish_render_queue(renderStart = int(TIMELINE.START), renderEnd = int(TIMELINE.END))
+
+def publish_queue_nopadding(self):
+    TIMELINE = TimelineProperties()
+    publish_render_queue(renderStart = int(TIMELINE.INNER_START), renderEnd = int(TIMELINE.INNER_END))
+
+def join_queue(self):
+    join_render_queue()
+
+def queue_status(self):
+    show_render_queue_status()
+
 def render_one_frame_png(self):
-    toggle_render_settings()
     render_frame(width = get_resolution_settings("width"), height = get_resolution_settings("height"), frame=cmds.currentTime(query=True), file_format="png")
 
 def render_one_frame_tif(self):
-    toggle_render_settings()
     render_frame(width = get_resolution_settings("width"), height = get_resolution_settings("height"), frame=cmds.currentTime(query=True), file_format="tif")
 
+def render_one_frame_tiled_png(self):
+    render_tiled_frame(frame=cmds.currentTime(query=True), file_format="png")
+
+def render_one_frame_tiled_tif(self):
+    render_tiled_frame(frame=cmds.currentTime(query=True), file_format="tif")
+
+def render_w_padding_auto_format(self):
+    TIMELINE = TimelineProperties()
+    batch_render(renderStart = int(TIMELINE.START), renderEnd = int(TIMELINE.END), target_format = "auto")
+
+def render_nopadding_auto_format(self):
+    TIMELINE = TimelineProperties()
+    batch_render(renderStart = int(TIMELINE.INNER_START), renderEnd = int(TIMELINE.INNER_END), target_format = "auto")
+
+def benchmark_image_formats(self):
+    results, choice = run_codec_benchmark()
+    msg = "\n".join(animkit_zoetrope_codecs.format_result(result) for result in results)
+    msg += "\n\nBatches with the benchmarked format render " + (choice["name"] if choice else "tif, no format meets the policy") + " images."
+    cmds.confirmDialog(title='Animkit Zoetrope: Image Format Benchmark.', message=msg, button=['I got it!'], defaultButton='I got it!', dismissString='I got it!')
+
+def convert_textures_tx(self):
+    summary = preflight_textures()[1]
+    cmds.confirmDialog(title='Animkit Zoetrope: Texture Pre-flight.', message=summary, button=['I got it!'], defaultButton='I got it!', dismissString='I got it!')
+
+def render_resume_last_batch(self):
+    resume_last_batch()
+
 def smart_convert_all_renders_compressed(self):
     video_converter(targetFormat = "mp4")
 
 def smart_convert_all_renders_lossless(self):
     video_converter(targetFormat = "avi")
 
+def smart_convert_all_renders_preview(self):
+    video_converter(targetFormat = "mp4", preview = True)
+
 
     
\ No newline at end of file
@@ -0,0 +1,95 @@
+##############################################################################################
+
+# animkit_zoetrope_codecs.py
+# Benchmarks the image formats Zoetrope can render to on a sample frame: write time, read time and size of
+# TIFF, PNG and EXR with their compressions, written and read back with oiiotool. choose_codec then picks the
+# fastest one that meets a size / quality policy for the batch.
+
+##############################################################################################
+import os, subprocess, time
+from animkit_zoetrope_pool import find_mtoa_executable
+
+# name: image format, oiiotool arguments writing it, Arnold driver settings rendering it (None if Arnold cannot
+# write it, then it is only benchmarked) and whether it keeps every value of the render.
+# Arnold writes 8 bit TIFF and PNG and half float EXR by default, the benchmark writes the same.
+# Text values of Arnold settings are enum names, they are looked up on the driver when a batch starts.
+CODECS = [
+    {"name": "tif_none", "format": "tif", "oiio": ["-d", "uint8", "--compression", "none"], "arnold": {"defaultArnoldDriver.tiffCompression": "none"}, "lossless": True},
+    {"name": "tif_lzw", "format": "tif", "oiio": ["-d", "uint8", "--compression", "lzw"], "arnold": {"defaultArnoldDriver.tiffCompression": "lzw"}, "lossless": True},
+    {"name": "png_1", "format": "png", "oiio": ["-d", "uint8", "--attrib", "png:compressionLevel", "1"], "arnold": None, "lossless": True},
+    {"name": "png_6", "format": "png", "oiio": ["-d", "uint8", "--attrib", "png:compressionLevel", "6"], "arnold": {}, "lossless": True},
+    {"name": "png_9", "format": "png", "oiio": ["-d", "uint8", "--attrib", "png:compressionLevel", "9"], "arnold": None, "lossless": True},
+    {"name": "exr_zip", "format": "exr", "oiio": ["-d", "half", "--compression", "zip"], "arnold": {"defaultArnoldDriver.exrCompression": "zip", "defaultArnoldDriver.halfPrecision": 1}, "lossless": True},
+    {"name": "exr_piz", "format": "exr", "oiio": ["-d", "half", "--compression", "piz"], "arnold": {"defaultArnoldDriver.exrCompression": "piz", "defaultArnoldDriver.halfPrecision": 1}, "lossless": True},
+    {"name": "exr_dwaa", "format": "exr", "oiio": ["-d", "half", "--compression", "dwaa"], "arnold": {"defaultArnoldDriver.exrCompression": "dwaa", "defaultArnoldDriver.halfPrecision": 1}, "lossless": False},
+]
+
+# lossless: only formats that keep every value. max_megabytes: largest frame allowed, None for any size.
+# reads: how often a frame is read after the render (comp, encoding), reading counts that many times.
+CODEC_POLICY = {"lossless": True, "max_megabytes": None, "reads": 2}
+
+CODEC_RESULTS_NAME = "zoetrope_codecs.json"
+
+
+def get_codec(name):
+    for codec in CODECS:
+        if codec["name"] == name: return codec
+    return None
+
+def _timed_run(argv, repeats):
+    '''
+    Runs argv repeats times and returns the fastest wall time in seconds. Raises if it fails.
+    '''
+    best = None
+    with open(os.devnull, "w") as devnull:
+        for index in range(repeats):
+            start = time.time()
+            proc = subprocess.Popen(argv, stdout = devnull, stderr = subprocess.PIPE)
+            error = proc.communicate()[1]
+            if proc.returncode != 0:
+                raise Exception("[ZOETROPE] ERROR: _timed_run() - " + os.path.basename(argv[0]) + " failed: " + error.decode("utf-8", "replace").strip() + "!!!")
+            seconds = time.time() - start
+            best = seconds if best is None else min(best, seconds)
+    return best
+
+
+# =================================================== Benchmark ===================================================
+def benchmark_codecs(sample, work_folder, oiiotool = None, codecs = None, repeats = 3):
+    '''
+    Writes sample in every codec into work_folder and reads it back with oiiotool, the fastest of repeats runs counts.
+    Returns a list of {"name", "format", "lossless", "renderable", "write_seconds", "read_seconds", "bytes"}, with "error"
+    instead of the measurements for codecs that failed. Pass another executable as oiiotool to test without Arnold.
+    '''
+    oiiotool = oiiotool or find_mtoa_executable("oiiotool") or "oiiotool"
+    if not os.path.isdir(work_folder): os.makedirs(work_folder)
+    results = []
+    for codec in codecs or CODECS:
+        result = {"name": codec["name"], "format": codec["format"], "lossless": codec["lossless"], "renderable": codec["arnold"] is not None}
+        output = os.path.join(work_folder, "sample_" + codec["name"] + "." + codec["format"])
+        try:
+            result["write_seconds"] = _timed_run([oiiotool, sample] + codec["oiio"] + ["-o", output], repeats)
+            result["read_seconds"] = _timed_run([oiiotool, output, "--printstats"], repeats)
+            result["bytes"] = os.path.getsize(output)
+        except Exception as e:
+            result["error"] = str(e)
+        finally:
+            if os.path.exists(output): os.remove(output)
+        print("[Zoetrope] Codec Benchmark - " + format_result(result))
+        results.append(result)
+    return results
+
+def format_result(result):
+    if "error" in result: return result["name"] + ": " + result["error"]
+    return "%s: write %.2fs, read %.2fs, %.1f MB%s" % (result["name"], result["write_seconds"], result["read_seconds"], result["bytes"] / float(1 << 20),
+                                                        "" if result["renderable"] else " (Arnold cannot write it)")
+
+def choose_codec(results, policy = None):
+    '''
+    Returns the result of the fastest codec Arnold can render that meets policy (see CODEC_POLICY), or None.
+    '''
+    policy = dict(CODEC_POLICY, **(policy or {}))
+    candidates = [result for result in results if "error" not in result and result["renderable"]
+                  and (result["lossless"] or not policy["lossless"])
+                  and (policy["max_megabytes"] is None or result["bytes"] <= policy["max_megabytes"] * (1 << 20))]
+    if not candidates: return None
+    return min(candidates, key = lambda result: result["write_seconds"] + result["read_seconds"] * policy["reads"])
@@ -0,0 +1,93 @@
+##############################################################################################
+
+# animkit_zoetrope_history.py
+# Local SQLite history of Zoetrope render times, per shot, layer and frame.
+# Every batch adds the frames it rendered, and new batches are predicted from it before they start.
+
+##############################################################################################
+import os, sqlite3, time
+
+HISTORY_NAME = "animkit_zoetrope_history.db"
+
+# How many of the most recent frames of a shot and layer a prediction averages.
+HISTORY_SAMPLES = 200
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS frames (
+    shot TEXT NOT NULL,
+    layer TEXT NOT NULL,
+    frame INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    format TEXT,
+    seconds REAL NOT NULL,
+    peak_rss INTEGER,
+    recorded REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS frames_shot_layer ON frames (shot, layer, recorded);
+'''
+
+
+class RenderHistory(object):
+    '''
+    Render times of earlier batches in a SQLite file. Each call opens its own connection, so the history can be
+    used from any thread and by several Maya sessions at once.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder): os.makedirs(folder)
+        db = self._connect()
+        try:
+            db.executescript(SCHEMA)
+        finally:
+            db.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout = 30)
+
+    def record(self, shot, frames):
+        '''
+        Adds rendered frames, dicts with "layer", "frame", "width", "height", "format", "seconds" and optionally "peak_rss".
+        '''
+        now = time.time()
+        rows = [(shot, frame["layer"], int(frame["frame"]), int(frame["width"]), int(frame["height"]), frame.get("format"),
+                 float(frame["seconds"]), int(frame.get("peak_rss") or 0), now) for frame in frames if frame["seconds"]]
+        if not rows: return 0
+        db = self._connect()
+        try:
+            with db:
+                db.executemany("INSERT INTO frames VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        finally:
+            db.close()
+        return len(rows)
+
+    def _seconds_per_pixel(self, db, where, args, samples):
+        '''
+        Returns (average seconds per pixel, frames averaged) of the most recent frames matching where.
+        '''
+        rows = db.execute("SELECT seconds, width * height FROM frames WHERE " + where + " ORDER BY recorded DESC LIMIT ?", tuple(args) + (samples,)).fetchall()
+        rows = [(seconds, pixels) for seconds, pixels in rows if pixels]
+        if not rows: return 0.0, 0
+        return sum(seconds / float(pixels) for seconds, pixels in rows) / len(rows), len(rows)
+
+    def predict(self, shot, layers, frame_count, width, height, samples = HISTORY_SAMPLES):
+        '''
+        Returns (predicted seconds, frames of history used) for rendering frame_count frames of every layer at width x height,
+        or None without any history to go by. Render time is assumed to grow with the pixel count.
+        A layer never rendered in this shot is predicted from the other layers of the shot, then from the same layer in other shots.
+        '''
+        total, used = 0.0, 0
+        db = self._connect()
+        try:
+            for layer in layers:
+                for where, args in (("shot = ? AND layer = ?", (shot, layer)), ("shot = ?", (shot,)), ("layer = ?", (layer,))):
+                    rate, count = self._seconds_per_pixel(db, where, args, samples)
+                    if count: break
+                if not count: return None
+                total += rate * width * height * frame_count
+                used += count
+        finally:
+            db.close()
+        return total, used
@@ -0,0 +1,187 @@
+##############################################################################################
+
+# animkit_zoetrope_jobs.py
+# Runs long Zoetrope jobs (batch renders) without taking Maya hostage.
+# A JobController steps the job from a QTimer on Maya's main thread, one frame per tick, so the UI keeps
+# running between frames. JobProgressDialog shows its progress and can pause or cancel it.
+
+##############################################################################################
+from PySide2 import QtCore
+from PySide2 import QtWidgets
+
+from shiboken2 import wrapInstance
+import maya.OpenMayaUI as omui
+
+import traceback
+from animkit_zoetrope_telemetry import format_duration
+
+
+def maya_main_window():
+    main_window_ptr = omui.MQtUtil.mainWindow()
+    return wrapInstance(int(main_window_ptr), QtWidgets.QWidget)
+
+
+# =================================================== Job Controller ===================================================
+class JobController(QtCore.QObject):
+    '''
+    Steps a job from a zero interval QTimer. A job has start(), step() -> False once nothing is left,
+    progress() -> dict (see BatchRenderJob.progress) and finish(cancelled) -> exit message.
+    pause() and cancel() take effect after the step that is running, the job is always finished exactly once.
+    '''
+    progressed = QtCore.Signal()
+    paused_changed = QtCore.Signal(bool)
+    finished = QtCore.Signal(str)
+
+    def __init__(self, job, parent = None):
+        super(JobController, self).__init__(parent)
+        self.job = job
+        self.paused = False
+        self.cancelled = False
+        self.running = False
+        self.message = None
+        self._stepping = False
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._tick)
+
+    def start(self):
+        self.job.start()
+        self.running = True
+        self._timer.start()
+
+    def pause(self):
+        self.paused = True
+        self._timer.stop()
+        self.paused_changed.emit(True)
+
+    def resume(self):
+        if not self.running: return
+        self.paused = False
+        self._timer.start()
+        self.paused_changed.emit(False)
+
+    def cancel(self):
+        self.cancelled = True
+        # Qt can run this while a frame renders, the step still needs the job, _tick finishes it afterwards.
+        if not self._stepping: self._finish()
+
+    def _tick(self):
+        if self.paused or not self.running:
+            self._timer.stop()
+            return
+        self._stepping = True
+        try:
+            more = self.job.step()
+        except Exception:
+            print("[Zoetrope] Job Controller - Frame failed, cancelling the job:\n" + traceback.format_exc())
+            self.cancelled = True
+            more = False
+        finally:
+            self._stepping = False
+        self.progressed.emit()
+        if not more or self.cancelled:
+            self._finish()
+
+    def _finish(self):
+        if not self.running: return
+        self.running = False
+        self._timer.stop()
+        self.message = self.job.finish(cancelled = self.cancelled or not self.job.done)
+        self.finished.emit(self.message)
+
+
+# =================================================== Progress Dialog ===================================================
+class JobProgressDialog(QtWidgets.QDialog):
+
+    def __init__(self, controller, title = "Zoetrope", parent = None):
+        super(JobProgressDialog, self).__init__(parent or maya_main_window())
+        self.controller = controller
+
+        self.setWindowTitle("AnimKit " + title)
+        self.setMinimumWidth(480)
+        self.setWindowFlags(self.windowFlags() ^ QtCore.Qt.WindowContextHelpButtonHint)  # Delete Question Mark
+
+        self.create_widgets()
+        self.create_layouts()
+        controller.progressed.connect(self.refresh)
+        controller.paused_changed.connect(self.on_paused_changed)
+        controller.finished.connect(self.on_finished)
+
+    def create_widgets(self):
+        self.totalLabel = QtWidgets.QLabel("Starting...")
+        self.totalBar = QtWidgets.QProgressBar()
+        self.layerLabel = QtWidgets.QLabel("")
+        self.layerBar = QtWidgets.QProgressBar()
+        self.throughputLabel = QtWidgets.QLabel("")
+
+        self.pauseButton = QtWidgets.QPushButton("Pause After This Frame")
+        self.pauseButton.clicked.connect(self.on_pause)
+        self.cancelButton = QtWidgets.QPushButton("Cancel")
+        self.cancelButton.setToolTip('Stops after the current frame and <b>restores the render settings</b>.')
+        self.cancelButton.clicked.connect(self.controller.cancel)
+
+    def create_layouts(self):
+        buttons = QtWidgets.QHBoxLayout()
+        buttons.addStretch()
+        buttons.addWidget(self.pauseButton)
+        buttons.addWidget(self.cancelButton)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.totalLabel)
+        layout.addWidget(self.totalBar)
+        layout.addWidget(self.layerLabel)
+        layout.addWidget(self.layerBar)
+        layout.addWidget(self.throughputLabel)
+        layout.addLayout(buttons)
+
+    def refresh(self):
+        progress = self.controller.job.progress()
+        self.totalLabel.setText("All layers: " + str(progress["done"]) + " / " + str(progress["total"]) + " frames")
+        self.totalBar.setRange(0, max(1, progress["total"]))
+        self.totalBar.setValue(progress["done"])
+        self.layerLabel.setText(str(progress["layer"]) + ": " + str(progress["layer_done"]) + " / " + str(progress["layer_total"]) + " frames, next frame " + str(progress["frame"]))
+        self.layerBar.setRange(0, max(1, progress["layer_total"]))
+        self.layerBar.setValue(progress["layer_done"])
+        if progress["seconds_per_frame"]:
+            text = "%.1f frames / minute" % (60.0 / progress["seconds_per_frame"])
+            if progress["eta"] is not None: text += ", ETA " + format_duration(progress["eta"])
+            self.throughputLabel.setText(text)
+
+    def on_pause(self):
+        if self.controller.paused:
+            self.controller.resume()
+        else:
+            self.controller.pause()
+
+    def on_paused_changed(self, paused):
+        self.pauseButton.setText("Resume" if paused else "Pause After This Frame")
+
+    def on_finished(self, message):
+        self.accept()
+
+    def closeEvent(self, event):
+        # Closing the window cancels the job, so the scene never stays in a half rendered state.
+        self.controller.cancel()
+        super(JobProgressDialog, self).closeEvent(event)
+
+    def reject(self):
+        # Escape cancels as well.
+        self.controller.cancel()
+        super(JobProgressDialog, self).reject()
+
+
+def run_job(job, title = "Zoetrope"):
+    '''
+    Starts job in a JobController with a progress dialog. Returns the controller, the job runs once Maya is idle.
+    '''
+    controller = JobController(job, maya_main_window())
+    dialog = JobProgressDialog(controller, title)
+    controller.dialog = dialog  # Keeps the dialog alive as long as the controller.
+    dialog.show()
+    try:
+        controller.start()
+    except Exception:
+        dialog.close()
+        raise
+    dialog.refresh()
+    return controller
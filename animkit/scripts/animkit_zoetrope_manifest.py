@@ -0,0 +1,136 @@
+##############################################################################################
+
+# animkit_zoetrope_manifest.py
+# On-disk job manifest of Zoetrope batches, so a crashed batch can resume where it stopped.
+# Lives at /renders/zoetrope_manifest.json, next to the /renders/<layer>/ folders it describes.
+# Frames also carry the fingerprint of the scene they were rendered from, so unchanged frames can be left alone.
+
+##############################################################################################
+import hashlib, json, os, threading, time
+
+MANIFEST_NAME = "zoetrope_manifest.json"
+
+# Recorded frames are written out once this many wait, or once the oldest waited SAVE_SECONDS. flush() writes the rest.
+# A crash loses at most these, and they only render again on resume.
+SAVE_FRAMES = 25
+SAVE_SECONDS = 10.0
+
+
+# =================================================== File Helpers ===================================================
+def file_checksum(file_path, block_size = 1 << 20):
+    '''
+    Returns the md5 hex digest of a file, read in blocks.
+    '''
+    digest = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def replace_file(temp_path, file_path):
+    '''
+    Renames temp_path to file_path, replacing file_path if it exists.
+    '''
+    try:
+        os.replace(temp_path, file_path)
+    except AttributeError:  # Python 2 has no os.replace, and os.rename does not overwrite on Windows.
+        if os.path.exists(file_path): os.remove(file_path)
+        os.rename(temp_path, file_path)
+
+def write_json_atomic(file_path, data, temp_suffix = ".tmp"):
+    '''
+    Writes data as JSON to file_path + temp_suffix first and then swaps it in, so a crash never leaves half a file.
+    '''
+    temp_path = file_path + temp_suffix
+    with open(temp_path, "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    replace_file(temp_path, file_path)
+
+
+# =================================================== Render Manifest ===================================================
+class RenderManifest(object):
+    '''
+    Records the settings of the last batch and every completed (layer, frame) with its output size and checksum.
+    Thread safe, background renderers can record frames as they finish. Frames are saved save_frames at a time or
+    after save_seconds (see SAVE_FRAMES), call flush() when the batch ends.
+    '''
+
+    def __init__(self, renders_folder, save_frames = SAVE_FRAMES, save_seconds = SAVE_SECONDS):
+        self.path = os.path.join(renders_folder, MANIFEST_NAME)
+        self.data = {"batch": {}, "layers": {}}
+        self.save_frames = max(1, int(save_frames))
+        self.save_seconds = save_seconds
+        self._unsaved = 0
+        self._unsaved_since = None
+        self._lock = threading.Lock()
+
+        if os.path.isfile(self.path):
+            try:
+                with open(self.path) as f:
+                    self.data = json.load(f)
+            except ValueError:
+                print("[Zoetrope] Render Manifest - Ignoring unreadable manifest at " + self.path + " .")
+
+    @property
+    def batch(self):
+        return self.data.get("batch", {})
+
+    def start_batch(self, layers, **settings):
+        '''
+        Remembers the settings of a new batch and forgets the completed frames of the layers it renders.
+        '''
+        with self._lock:
+            self.data["batch"] = dict(settings, layers = list(layers))
+            for layer in layers:
+                self.data["layers"][layer] = {}
+            self.save()
+
+    def record(self, layer, frame, image_path, **extra):
+        '''
+        Marks a frame as done. Extra keyword arguments are stored with it.
+        '''
+        entry = {"file": os.path.basename(image_path), "bytes": os.path.getsize(image_path), "md5": file_checksum(image_path), "time": time.time()}
+        entry.update(extra)
+        with self._lock:
+            self.data["layers"].setdefault(layer, {})[str(frame)] = entry
+            self._unsaved += 1
+            if self._unsaved_since is None: self._unsaved_since = entry["time"]
+            if self._unsaved >= self.save_frames or entry["time"] - self._unsaved_since >= self.save_seconds:
+                self.save()
+
+    def flush(self):
+        '''
+        Saves the frames recorded since the last save.
+        '''
+        with self._lock:
+            if self._unsaved: self.save()
+
+    def entry(self, layer, frame):
+        return self.data["layers"].get(layer, {}).get(str(frame))
+
+    def is_done(self, layer, frame, image_path):
+        '''
+        Returns True if the frame was recorded and its output on disk still has the recorded size and checksum.
+        '''
+        entry = self.entry(layer, frame)
+        if entry is None or not os.path.isfile(image_path):
+            return False
+        if os.path.getsize(image_path) != entry["bytes"]:
+            return False
+        return file_checksum(image_path) == entry["md5"]
+
+    def is_current(self, layer, frame, image_path, fingerprint):
+        '''
+        Returns True if the frame is done (see is_done) and was rendered from a scene with the same fingerprint.
+        '''
+        entry = self.entry(layer, frame)
+        if entry is None or fingerprint is None or entry.get("fingerprint") != fingerprint:
+            return False
+        return self.is_done(layer, frame, image_path)
+
+    def save(self):
+        folder = os.path.dirname(self.path)
+        if not os.path.exists(folder): os.makedirs(folder)
+        write_json_atomic(self.path, self.data)
+        self._unsaved = 0
+        self._unsaved_since = None
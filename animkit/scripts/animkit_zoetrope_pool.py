@@ -0,0 +1,354 @@
+##############################################################################################
+
+# animkit_zoetrope_pool.py
+# Process pools used by Zoetrope to render outside of the interactive Maya session.
+# Nothing in here imports Maya, so the schedulers also run (with fake workers) on a plain Python install.
+
+##############################################################################################
+import json, os, subprocess, sys, threading, time
+from collections import deque
+from multiprocessing.pool import ThreadPool
+
+try:
+    import queue
+except ImportError:  # Python 2 (Maya 2020 and below)
+    import Queue as queue
+
+# Every reply a worker sends back starts with this tag. Anything else on its stdout (Maya and Arnold logs) is ignored.
+RESULT_TAG = "[ZOETROPE_RESULT] "
+
+# How many trailing log lines of a worker are kept to explain a crash.
+LOG_TAIL = 20
+
+
+# =================================================== Protocol ===================================================
+def encode_message(payload):
+    '''
+    Returns the line a worker prints to report the result of one work item.
+    '''
+    return RESULT_TAG + json.dumps(payload)
+
+def decode_message(line):
+    '''
+    Returns the payload of a result line, or None if the line is ordinary log output.
+    '''
+    if not line.startswith(RESULT_TAG):
+        return None
+    return json.loads(line[len(RESULT_TAG):])
+
+def creation_flags():
+    '''
+    Returns the subprocess creation flags that keep worker consoles from popping up on Windows.
+    '''
+    if sys.platform.startswith("win"):
+        return 0x08000000  # CREATE_NO_WINDOW
+    return 0
+
+
+# =================================================== Launchers ===================================================
+def find_mayapy():
+    '''
+    Returns the path of the mayapy interpreter that belongs to the running Maya.
+    '''
+    exe_name = "mayapy.exe" if sys.platform.startswith("win") else "mayapy"
+    candidates = [os.path.join(os.path.dirname(sys.executable), exe_name)]
+    if os.getenv("MAYA_LOCATION"):
+        candidates.append(os.path.join(os.getenv("MAYA_LOCATION"), "bin", exe_name))
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return exe_name  # Hope it is on the PATH.
+
+def mayapy_launcher(snapshot, scene, mayapy=None, script=None):
+    '''
+    Returns a launcher that starts animkit_zoetrope_worker.py in a headless mayapy.
+    snapshot is the scene file the workers open, scene is the path the outputs are named after.
+    '''
+    mayapy = mayapy or find_mayapy()
+    script = script or os.path.join(os.path.dirname(os.path.abspath(__file__)), "animkit_zoetrope_worker.py")
+
+    def launcher(index):
+        return [mayapy, script, snapshot, scene]
+    return launcher
+
+def queue_launcher(queue_folder, threads=None, mayapy=None, script=None):
+    '''
+    Returns a launcher that starts animkit_zoetrope_worker.py in a headless mayapy working on a shared work queue,
+    see animkit_zoetrope_queue. threads caps the Arnold threads of every worker.
+    '''
+    mayapy = mayapy or find_mayapy()
+    script = script or os.path.join(os.path.dirname(os.path.abspath(__file__)), "animkit_zoetrope_worker.py")
+
+    def launcher(index):
+        argv = [mayapy, script, "--queue", queue_folder]
+        if threads:
+            argv.append(str(threads))
+        return argv
+    return launcher
+
+def find_mtoa_executable(name):
+    '''
+    Returns the path of an executable shipped with MtoA (maketx, oiiotool...), or of the one on the PATH, or None.
+    '''
+    exe_name = name + ".exe" if sys.platform.startswith("win") else name
+    try:
+        import mtoa
+        mtoa_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(mtoa.__file__))))  # <mtoa>/scripts/mtoa/__init__.py
+        candidate = os.path.join(mtoa_root, "bin", exe_name)
+        if os.path.isfile(candidate):
+            return candidate
+    except ImportError:
+        pass
+    for folder in os.getenv("PATH", "").split(os.pathsep):
+        if os.path.isfile(os.path.join(folder, exe_name)):
+            return os.path.join(folder, exe_name)
+    return None
+
+def find_kick():
+    '''
+    Returns the path of the kick executable shipped with MtoA, or "kick" if it cannot be found.
+    '''
+    return find_mtoa_executable("kick") or "kick"
+
+def kick_command(kick=None, threads=None):
+    '''
+    Returns a function (ass_path, image_path, width, height) -> argv that renders one .ass file with kick.
+    Pass another executable (e.g. a stub script) as kick to test the pipeline without Arnold.
+    '''
+    kick = kick or find_kick()
+
+    def command(ass_path, image_path, width, height):
+        argv = [kick, "-i", ass_path, "-o", image_path, "-r", str(width), str(height), "-dw", "-dp", "-nstdin"]
+        if threads:
+            argv += ["-t", str(threads)]
+        return argv
+    return command
+
+def default_worker_count(cpu_count=None):
+    '''
+    Returns how many render workers to run at once. Arnold threads on its own, so a few workers are enough to fill a box.
+    '''
+    import multiprocessing
+    cpu_count = cpu_count or multiprocessing.cpu_count()
+    return max(1, min(4, cpu_count // 6))
+
+
+# =================================================== Worker Pool ===================================================
+class WorkerPool(object):
+    '''
+    Hands out work items (dicts) to a set of long lived worker processes.
+
+    launcher(index) returns the argv of worker number index. A worker reads one JSON work item per
+    line on stdin and answers each of them with exactly one encode_message() line on stdout.
+    Swap the launcher for one that starts a fake worker to exercise the scheduler without Maya.
+    With a governor (see animkit_zoetrope_resources) workers only start while memory fits them, and a worker
+    retires after its frame when memory runs low. Replies that carry a peak_rss feed the governor.
+    '''
+
+    def __init__(self, launcher, workers=1, on_result=None, governor=None):
+        self.launcher = launcher
+        self.workers = max(1, int(workers))
+        self.on_result = on_result
+        self.governor = governor
+        self.results = []
+        self._lock = threading.Lock()
+
+    def run(self, items):
+        '''
+        Renders every item and returns the list of results, in completion order.
+        '''
+        todo = queue.Queue()
+        for item in items:
+            todo.put(item)
+
+        threads = [threading.Thread(target=self._worker_loop, args=(index, todo)) for index in range(min(self.workers, todo.qsize()))]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.results
+
+    def _launch(self, index):
+        print("[Zoetrope] Worker Pool - Starting worker " + str(index) + ".")
+        return subprocess.Popen(self.launcher(index), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                universal_newlines=True, bufsize=1, creationflags=creation_flags())
+
+    def _worker_loop(self, index, todo):
+        proc = None
+        settled = False
+        while True:
+            try:
+                item = todo.get_nowait()
+            except queue.Empty:
+                break
+
+            if proc is None:
+                if self.governor is not None: self.governor.acquire()
+                proc = self._launch(index)
+                settled = False
+
+            start = time.time()
+            reply, tail = self._send(proc, item)
+            if reply is None:
+                # The worker died on this item, the next item gets a fresh one.
+                proc.wait()
+                reply = {"ok": False, "error": "Worker exited with code " + str(proc.returncode) + ".\n" + "\n".join(tail)}
+                proc = None
+                if self.governor is not None: self.governor.release(settled)
+            elif self.governor is not None:
+                if settled:
+                    self.governor.record_peak(reply.get("peak_rss"))
+                else:
+                    self.governor.settle(reply.get("peak_rss"))
+                    settled = True
+                if self.governor.running > 1 and self.governor.under_pressure():
+                    print("[Zoetrope] Worker Pool - Memory is running low, retiring worker " + str(index) + ".")
+                    self._stop(proc, settled)
+                    proc = None
+
+            result = dict(item)
+            result.update(reply)
+            result.setdefault("seconds", time.time() - start)
+            result["worker"] = index
+            self._record(result)
+
+        if proc is not None:
+            self._stop(proc, settled)
+
+    def _stop(self, proc, settled=True):
+        proc.stdin.close()
+        proc.wait()
+        if self.governor is not None:
+            self.governor.release(settled)
+
+    def _send(self, proc, item):
+        '''
+        Returns (reply, last log lines) for one item. The reply is None if the worker died.
+        '''
+        tail = deque(maxlen=LOG_TAIL)
+        try:
+            proc.stdin.write(json.dumps(item) + "\n")
+            proc.stdin.flush()
+        except (IOError, OSError):
+            return None, tail
+
+        for line in iter(proc.stdout.readline, ""):
+            reply = decode_message(line.rstrip("\r\n"))
+            if reply is not None:
+                return reply, tail
+            tail.append(line.rstrip())
+        return None, tail
+
+    def _record(self, result):
+        with self._lock:
+            self.results.append(result)
+        status = "done" if result["ok"] else "FAILED"
+        print("[Zoetrope] Worker Pool - Worker " + str(result["worker"]) + " " + status + " layer " + str(result.get("layer")) + " frame " + str(result.get("frame")) + ".")
+        if self.on_result is not None:
+            self.on_result(result)
+
+
+# =================================================== Command Pool ===================================================
+class CommandPool(object):
+    '''
+    Runs one-shot commands (argv lists) with at most max_procs of them at a time.
+    Commands can be submitted while earlier ones are still running, call join() once everything is submitted.
+    With a governor (see animkit_zoetrope_resources) a command only starts while memory fits it.
+    '''
+
+    def __init__(self, max_procs=1, on_result=None, governor=None):
+        self.max_procs = max(1, int(max_procs))
+        self.on_result = on_result
+        self.governor = governor
+        self.results = []
+        self._lock = threading.Lock()
+        self._pool = ThreadPool(self.max_procs)
+
+    def submit(self, argv, info=None):
+        '''
+        Queues argv. info is a dict copied into the result of this command.
+        '''
+        self._pool.apply_async(self._run, (argv, dict(info or {})))
+
+    def join(self):
+        '''
+        Waits for every submitted command and returns the list of results, in completion order.
+        '''
+        self._pool.close()
+        self._pool.join()
+        return self.results
+
+    def _run(self, argv, result):
+        if self.governor is not None: self.governor.acquire()
+        start = time.time()
+        try:
+            proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, creationflags=creation_flags())
+            output = proc.communicate()[0]
+            result["ok"] = proc.returncode == 0
+            if not result["ok"]:
+                result["error"] = "Exited with code " + str(proc.returncode) + ".\n" + "\n".join(output.splitlines()[-LOG_TAIL:])
+        except OSError as e:
+            result["ok"] = False
+            result["error"] = "Could not start " + str(argv[0]) + ": " + str(e)
+        finally:
+            if self.governor is not None: self.governor.release(settled=False)
+        result["seconds"] = time.time() - start
+        self._record(result)
+
+    def _record(self, result):
+        with self._lock:
+            self.results.append(result)
+        if self.on_result is not None:
+            self.on_result(result)
+
+
+# =================================================== Task Pool ===================================================
+class TaskPool(object):
+    '''
+    Runs small Python callables (renaming, checksums, copies) on background threads while the caller keeps rendering.
+    wait() blocks until everything submitted so far is done, close() also stops the threads.
+    Exceptions are collected in errors as (info, traceback text) instead of being raised.
+    '''
+
+    def __init__(self, threads=2):
+        self.errors = []
+        self._todo = queue.Queue()
+        self._threads = [threading.Thread(target=self._loop) for index in range(max(1, int(threads)))]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def submit(self, func, *args, **kwargs):
+        '''
+        Queues func(*args, **kwargs). An info keyword argument is not passed on but reported with any error.
+        '''
+        info = kwargs.pop("info", None)
+        self._todo.put((func, args, kwargs, info))
+
+    def wait(self):
+        self._todo.join()
+        return self.errors
+
+    def close(self):
+        self.wait()
+        for thread in self._threads:
+            self._todo.put(None)
+        for thread in self._threads:
+            thread.join()
+        return self.errors
+
+    def _loop(self):
+        import traceback
+        while True:
+            task = self._todo.get()
+            if task is None:
+                self._todo.task_done()
+                break
+            func, args, kwargs, info = task
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                self.errors.append((info, traceback.format_exc()))
+            finally:
+                self._todo.task_done()
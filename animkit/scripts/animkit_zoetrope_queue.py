@@ -0,0 +1,208 @@
+##############################################################################################
+
+# animkit_zoetrope_queue.py
+# Serverless work queue of Zoetrope, a folder on a share that every workstation mounts.
+# Lives at /renders/zoetrope_queue/:
+#     batch.json    what to render (snapshot scene, scene name), written by the machine that publishes
+#     todo/         one <layer>.<frame>.json per frame still to render
+#     claimed/      tasks a worker took, renamed to <task>~<worker>~<claim time>, kept fresh by heartbeats
+#     done/         one result per rendered frame
+#     failed/       one result per frame that raised
+# Claims are atomic renames, so two workers can never take the same task. Nothing in here imports Maya.
+
+##############################################################################################
+import json, os, re, socket, threading, time, traceback
+from animkit_zoetrope_manifest import write_json_atomic
+
+QUEUE_FOLDER = "zoetrope_queue"
+BATCH_NAME = "batch.json"
+
+# A worker touches its claim every HEARTBEAT_SECONDS. Claims untouched for STALE_SECONDS go back to todo/.
+HEARTBEAT_SECONDS = 30
+STALE_SECONDS = 180
+
+CLAIM_SEPARATOR = "~"
+
+
+# =================================================== Helpers ===================================================
+def task_id(layer, frame):
+    return str(layer) + "." + str(frame)
+
+def default_worker_id():
+    '''
+    Returns a name for this worker that is unique across machines. Example: "ws-anim-03-4711"
+    '''
+    return re.sub(r"[^A-Za-z0-9_-]", "-", socket.gethostname()) + "-" + str(os.getpid())
+
+def write_json(file_path, data):
+    '''
+    Writes data atomically (see write_json_atomic), under a temporary name of this worker so machines never share one.
+    '''
+    write_json_atomic(file_path, data, "." + default_worker_id() + ".tmp")
+
+def read_json(file_path):
+    with open(file_path) as f:
+        return json.load(f)
+
+
+# =================================================== Work Queue ===================================================
+class WorkQueue(object):
+    '''
+    A queue of render tasks (dicts with at least "layer" and "frame") in a shared folder.
+    Any number of processes, on any number of machines, can publish() into it or work() on it at the same time.
+    '''
+
+    def __init__(self, root, stale_seconds = STALE_SECONDS):
+        self.root = root
+        self.stale_seconds = stale_seconds
+        self.folders = dict((name, os.path.join(root, name)) for name in ("todo", "claimed", "done", "failed"))
+        for folder in self.folders.values():
+            if not os.path.exists(folder):
+                try:
+                    os.makedirs(folder)
+                except OSError:  # Another machine made it first.
+                    pass
+
+    # ====================================== Publishing ======================================
+    def publish(self, items, **batch):
+        '''
+        Adds items to the queue. Keyword arguments are written to batch.json for the workers.
+        Items published again are rendered again, even if they are done.
+        '''
+        write_json(os.path.join(self.root, BATCH_NAME), batch)
+        for item in items:
+            name = task_id(item["layer"], item["frame"]) + ".json"
+            for folder in ("done", "failed"):
+                if os.path.exists(os.path.join(self.folders[folder], name)): os.remove(os.path.join(self.folders[folder], name))
+            write_json(os.path.join(self.folders["todo"], name), item)
+        print("[Zoetrope] Work Queue - Published " + str(len(items)) + " tasks to " + self.root + " .")
+
+    def read_batch(self):
+        return read_json(os.path.join(self.root, BATCH_NAME))
+
+    def status(self):
+        '''
+        Returns how many tasks are in each state. Example: {"todo": 40, "claimed": 3, "done": 57, "failed": 0}
+        '''
+        return dict((name, len([entry for entry in os.listdir(folder) if not entry.endswith(".tmp")])) for name, folder in self.folders.items())
+
+    def results(self, state = "done"):
+        '''
+        Returns the results of every task in state ("done" or "failed").
+        '''
+        folder = self.folders[state]
+        return [read_json(os.path.join(folder, name)) for name in sorted(os.listdir(folder)) if name.endswith(".json")]
+
+    # ====================================== Claiming ======================================
+    def claim(self, worker_id):
+        '''
+        Takes the next task. Returns (claim path, item), or None if nothing is left in todo/.
+        '''
+        todo = self.folders["todo"]
+        for name in sorted(os.listdir(todo)):
+            if not name.endswith(".json"): continue
+            claim_path = os.path.join(self.folders["claimed"], CLAIM_SEPARATOR.join([name, worker_id, str(int(time.time()))]))
+            try:
+                os.rename(os.path.join(todo, name), claim_path)
+            except OSError:  # Somebody else was faster.
+                continue
+            try:
+                return claim_path, read_json(claim_path)
+            except (IOError, OSError, ValueError):  # Reaped from under us already, try the next one.
+                continue
+        return None
+
+    def heartbeat(self, claim_path):
+        '''
+        Tells the other workers this claim is still being rendered. Returns False if the claim was reaped meanwhile.
+        '''
+        try:
+            os.utime(claim_path, None)
+            return True
+        except OSError:
+            return False
+
+    def complete(self, claim_path, result, state = "done"):
+        '''
+        Records the result of a claimed task in done/ (or failed/) and releases the claim.
+        '''
+        name = os.path.basename(claim_path).split(CLAIM_SEPARATOR)[0]
+        write_json(os.path.join(self.folders[state], name), result)
+        try:
+            os.remove(claim_path)
+        except OSError:  # Reaped meanwhile, the result still counts.
+            pass
+
+    def reap(self):
+        '''
+        Puts claims without a heartbeat for stale_seconds back into todo/. Returns how many were put back.
+        '''
+        reaped = 0
+        now = time.time()
+        claimed = self.folders["claimed"]
+        for claim_name in os.listdir(claimed):
+            parts = claim_name.split(CLAIM_SEPARATOR)
+            if len(parts) != 3: continue
+            name, worker_id, claimed_at = parts
+            claim_path = os.path.join(claimed, claim_name)
+            try:
+                last_seen = max(os.path.getmtime(claim_path), float(claimed_at))
+            except (OSError, ValueError):
+                continue
+            if now - last_seen < self.stale_seconds: continue
+
+            try:
+                if os.path.exists(os.path.join(self.folders["done"], name)):
+                    os.remove(claim_path)
+                else:
+                    os.rename(claim_path, os.path.join(self.folders["todo"], name))
+                    print("[Zoetrope] Work Queue - Worker " + worker_id + " went quiet, " + name + " is up for grabs again.")
+                    reaped += 1
+            except OSError:  # Another worker reaped it first.
+                pass
+        return reaped
+
+    # ====================================== Working ======================================
+    def work(self, render, worker_id = None, heartbeat_seconds = HEARTBEAT_SECONDS, poll_seconds = None):
+        '''
+        Claims and renders tasks until the queue is empty. render(item) returns a dict that is stored with the result.
+        While claims of other workers are outstanding, keeps polling in case one of them goes stale.
+        Returns how many tasks this worker completed.
+        '''
+        worker_id = worker_id or default_worker_id()
+        poll_seconds = poll_seconds or heartbeat_seconds
+        completed = 0
+        while True:
+            self.reap()
+            claim = self.claim(worker_id)
+            if claim is None:
+                if not os.listdir(self.folders["claimed"]): break
+                time.sleep(poll_seconds)
+                continue
+
+            claim_path, item = claim
+            stop = threading.Event()
+            beat = threading.Thread(target=self._heartbeat_loop, args=(claim_path, stop, heartbeat_seconds))
+            beat.daemon = True
+            beat.start()
+
+            start = time.time()
+            result = dict(item, worker = worker_id)
+            try:
+                result.update(render(item) or {})
+                result["ok"] = True
+            except Exception:
+                result.update(ok = False, error = traceback.format_exc())
+            finally:
+                stop.set()
+                beat.join()
+            result.setdefault("seconds", time.time() - start)
+            self.complete(claim_path, result, "done" if result["ok"] else "failed")
+            completed += 1
+            print("[Zoetrope] Work Queue - Worker " + worker_id + (" done " if result["ok"] else " FAILED ") + task_id(item["layer"], item["frame"]) + ".")
+        print("[Zoetrope] Work Queue - Worker " + worker_id + " found the queue empty after " + str(completed) + " tasks.")
+        return completed
+
+    def _heartbeat_loop(self, claim_path, stop, heartbeat_seconds):
+        while not stop.wait(heartbeat_seconds):
+            if not self.heartbeat(claim_path): break
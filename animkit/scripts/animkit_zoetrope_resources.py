@@ -0,0 +1,140 @@
+##############################################################################################
+
+# animkit_zoetrope_resources.py
+# Keeps parallel Zoetrope renders and encodes inside the memory of the workstation.
+# The ResourceGovernor hands out process slots: the first process probes how much memory one needs (peak RSS),
+# later ones only start while the available memory still fits another one, and pools give slots back under pressure.
+
+##############################################################################################
+import sys, threading
+
+# Memory left alone for Maya, ffmpeg and the rest of the system.
+RESERVE_BYTES = 2 << 30
+
+# Peak RSS is a peak, the next frame can need a bit more.
+HEADROOM = 1.25
+
+# How often a waiting launch looks at the available memory again.
+POLL_SECONDS = 2.0
+
+
+# =================================================== Memory ===================================================
+def read_meminfo(path = "/proc/meminfo"):
+    '''
+    Returns /proc/meminfo as {field: bytes}.
+    '''
+    info = {}
+    with open(path) as f:
+        for line in f:
+            field, value = line.split(":", 1)
+            parts = value.split()
+            info[field] = int(parts[0]) * (1024 if parts[1:] == ["kB"] else 1)
+    return info
+
+def available_memory_bytes():
+    '''
+    Returns how many bytes of memory can be used without swapping, or None if it cannot be measured here.
+    '''
+    if sys.platform.startswith("win"):
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(status)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return int(status.ullAvailPhys)
+        return None
+
+    try:
+        info = read_meminfo()
+    except (IOError, OSError, ValueError):
+        return None
+    if "MemAvailable" in info:
+        return info["MemAvailable"]
+    return info.get("MemFree", 0) + info.get("Buffers", 0) + info.get("Cached", 0)  # Kernels before 3.14.
+
+
+# =================================================== Resource Governor ===================================================
+class ResourceGovernor(object):
+    '''
+    Hands out at most max_slots process slots, and only as many as the available memory fits.
+    Pools call acquire() before starting a process and release() once it is gone. A process counts as starting,
+    with a whole peak of memory set aside for it, until the pool reports its first peak RSS with settle().
+    Until any peak is known only one process runs, unless probe_first is False. peak_bytes is an estimate to start from,
+    processes are then held back by it right away instead of waiting for the first one.
+    memory_probe() returns the available bytes, swap it for a fake to test the throttling.
+    '''
+
+    def __init__(self, max_slots, reserve_bytes = RESERVE_BYTES, headroom = HEADROOM, probe_first = True, memory_probe = available_memory_bytes, poll_seconds = POLL_SECONDS, peak_bytes = 0):
+        self.max_slots = max(1, int(max_slots))
+        self.reserve_bytes = reserve_bytes
+        self.headroom = headroom
+        self.probe_first = probe_first
+        self.memory_probe = memory_probe
+        self.poll_seconds = poll_seconds
+        self.running = 0
+        self.starting = 0
+        self.peak_bytes = int(peak_bytes or 0)
+        self._condition = threading.Condition()
+
+    def record_peak(self, peak_rss):
+        if not peak_rss: return
+        with self._condition:
+            self.peak_bytes = max(self.peak_bytes, int(peak_rss))
+            self._condition.notify_all()
+
+    def settle(self, peak_rss = None):
+        '''
+        Tells the governor a process finished its first frame, its memory now shows in the available memory.
+        '''
+        with self._condition:
+            self.starting = max(0, self.starting - 1)
+            if peak_rss: self.peak_bytes = max(self.peak_bytes, int(peak_rss))
+            self._condition.notify_all()
+
+    def can_launch(self):
+        '''
+        Returns True if one more process fits now. One process can always run, so nothing ever starves.
+        '''
+        if self.running >= self.max_slots: return False
+        if self.running == 0: return True
+        available = self.memory_probe()
+        if available is None: return True
+        if self.peak_bytes: return available - self.reserve_bytes >= self.peak_bytes * self.headroom * (1 + self.starting)
+        return not self.probe_first and available >= self.reserve_bytes
+
+    def under_pressure(self):
+        '''
+        Returns True if the available memory dropped into the reserve, pools should then shrink by a process.
+        '''
+        available = self.memory_probe()
+        return available is not None and available < self.reserve_bytes
+
+    def acquire(self):
+        '''
+        Blocks until one more process fits, then takes its slot.
+        '''
+        with self._condition:
+            waited = False
+            while not self.can_launch():
+                if not waited: print("[Zoetrope] Resource Governor - Holding a launch until memory frees up (" + str(self.running) + " running).")
+                waited = True
+                self._condition.wait(self.poll_seconds)
+            self.running += 1
+            self.starting += 1
+
+    def release(self, settled = True):
+        '''
+        Gives the slot of a process back. settled is False if the process never reached settle().
+        '''
+        with self._condition:
+            self.running = max(0, self.running - 1)
+            if not settled: self.starting = max(0, self.starting - 1)
+            self._condition.notify_all()
+
@@ -0,0 +1,146 @@
+##############################################################################################
+
+# animkit_zoetrope_sequences.py
+# Finds the image sequences of a render folder in one directory scan.
+# Files are grouped by (prefix, padding, extension), frames parse the way Maya pads them, negative ones included
+# ("0-24" is frame -24 at padding 4), and the scan of a folder is cached until the folder changes.
+
+##############################################################################################
+import os, re, threading
+
+try:
+    from os import scandir
+except ImportError:  # Python 2, use the scandir backport if it is there.
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+IMAGE_EXTENSIONS = ["jpg", "jpeg", "png", "tiff", "tif", "exr"]
+
+# prefix, frame token, extension. Maya puts the zeros of a negative frame before the sign ("0-24"), and never pads
+# after it, which tells "shot_0-24.tif" (frame -24) from "shot-0024.tif" (frame 24).
+FRAME_PATTERN = re.compile(r"^(?P<prefix>.*?)(?P<frame>\d*-[1-9]\d*|\d+)\.(?P<ext>[A-Za-z0-9]+)$")
+
+
+def parse_frame(token):
+    '''
+    Returns the frame of a padded frame token: "0012" -> 12, "0-24" -> -24, "-100" -> -100.
+    '''
+    if "-" in token: return -int(token.split("-", 1)[1])
+    return int(token)
+
+def list_files(folder):
+    '''
+    Returns the names of the files in folder, in one pass over the directory.
+    '''
+    if scandir is not None:
+        return [entry.name for entry in scandir(folder) if entry.is_file()]
+    return [name for name in os.listdir(folder) if os.path.isfile(os.path.join(folder, name))]
+
+
+# =================================================== Sequence ===================================================
+class Sequence(object):
+    '''
+    One image sequence of a folder, prefix + padded frame + "." + ext. files maps every frame to its file name,
+    gaps are the frames missing between start and end.
+    '''
+
+    def __init__(self, folder, prefix, padding, ext, files):
+        self.folder = folder
+        self.prefix = prefix
+        self.padding = padding
+        self.ext = ext
+        self.files = files
+        self.frames = sorted(files)
+        self.start = self.frames[0]
+        self.end = self.frames[-1]
+        present = set(self.frames)
+        self.gaps = [frame for frame in range(self.start, self.end + 1) if frame not in present]
+
+    def path(self, frame):
+        return os.path.join(self.folder, self.files[frame])
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __repr__(self):
+        return "<Sequence %s%s.%s %d-%d, %d gaps>" % (self.prefix, "#" * self.padding, self.ext, self.start, self.end, len(self.gaps))
+
+
+def group_sequences(folder, names):
+    '''
+    Returns the Sequences among the file names of folder, the longest first.
+    A frame written with leading zeros ("0012") fixes the padding of its sequence, frames without ("1024", "-100") join the
+    sequence of the same prefix and extension whose padding they fit, or make up one of their own.
+    '''
+    padded, unpadded = {}, {}
+    for name in names:
+        match = FRAME_PATTERN.match(name)
+        if match is None: continue
+        prefix, token, ext = match.group("prefix"), match.group("frame"), match.group("ext")
+        if token[0] == "0" and len(token) > 1:
+            padded.setdefault((prefix, len(token), ext), {})[parse_frame(token)] = name
+        else:
+            unpadded.setdefault((prefix, ext), []).append((token, name))
+
+    for (prefix, ext), tokens in unpadded.items():
+        paddings = sorted(padding for key_prefix, padding, key_ext in padded if (key_prefix, key_ext) == (prefix, ext))
+        for token, name in tokens:
+            fitting = [padding for padding in paddings if padding <= len(token)]
+            padding = fitting[-1] if fitting else min(len(other) for other, other_name in tokens)
+            padded.setdefault((prefix, padding, ext), {})[parse_frame(token)] = name
+
+    sequences = [Sequence(folder, prefix, padding, ext, files) for (prefix, padding, ext), files in padded.items()]
+    return sorted(sequences, key = lambda sequence: (-len(sequence), sequence.prefix, sequence.ext))
+
+
+# =================================================== Sequence Index ===================================================
+class SequenceIndex(object):
+    '''
+    Caches the Sequences of every folder it scanned, keyed by the modification time of the folder. Adding, removing or
+    renaming a file changes it, so a cached scan is reused until then. Thread safe.
+    '''
+
+    def __init__(self):
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stamp(folder):
+        stat = os.stat(folder)
+        return getattr(stat, "st_mtime_ns", stat.st_mtime)
+
+    def scan(self, folder):
+        '''
+        Returns the Sequences of folder, the longest first. A folder that does not exist has none.
+        '''
+        folder = os.path.normpath(folder)
+        if not os.path.isdir(folder): return []
+        stamp = self._stamp(folder)
+        with self._lock:
+            cached = self._cache.get(folder)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        sequences = group_sequences(folder, list_files(folder))
+        with self._lock:
+            self._cache[folder] = (stamp, sequences)
+        return sequences
+
+    def find(self, folder, prefix = None, ext = None, images_only = True):
+        '''
+        Returns the longest Sequence of folder with prefix and ext (any if None), or None.
+        '''
+        for sequence in self.scan(folder):
+            if prefix is not None and sequence.prefix != prefix: continue
+            if ext is not None and sequence.ext.lower() != ext.lower(): continue
+            if images_only and sequence.ext.lower() not in IMAGE_EXTENSIONS: continue
+            return sequence
+        return None
+
+    def invalidate(self, folder = None):
+        with self._lock:
+            if folder is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.path.normpath(folder), None)
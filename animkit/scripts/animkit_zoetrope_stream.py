@@ -0,0 +1,120 @@
+##############################################################################################
+
+# animkit_zoetrope_stream.py
+# Encodes a render layer into a video while its frames are still rendering.
+# Every finished image is piped, in frame order, into one long lived ffmpeg (image2pipe), so the video is done
+# moments after the last frame instead of after a second pass over the whole sequence.
+
+##############################################################################################
+import os, shutil, subprocess, threading
+from animkit_zoetrope_pool import creation_flags
+
+try:
+    import queue
+except ImportError:  # Python 2 (Maya 2020 and below)
+    import Queue as queue
+
+# ffmpeg decoders of the image formats that can be streamed. image2pipe can only split images back apart with a
+# parser of the codec, ffmpeg has none for TIFF and EXR, those are encoded once the batch is done.
+IMAGE_CODECS = {"png": "png", "jpg": "mjpeg", "jpeg": "mjpeg"}
+
+# Default output settings, the same as video_encoder().
+VIDEO_ARGS = ["-c:v", "libx264", "-pix_fmt", "yuv420p"]
+
+# Queued in place of an image to show the image before it for one more frame.
+HOLD = "hold"
+
+
+def can_stream(image_format):
+    return image_format.lower() in IMAGE_CODECS
+
+
+class StreamingEncoder(object):
+    '''
+    Pipes the images of frames into ffmpeg, in order, as they are added.
+    add() can be called from any thread in any order. A frame that arrives before the frames ahead of it waits in a
+    reorder buffer (paths only, the images stay on disk) and is written as soon as the gap closes.
+    close() writes what is left, with frames that never arrived holding the frame before them, and finishes the video.
+    Frames before the first image show that image.
+    '''
+
+    def __init__(self, frames, video_path, image_format, frame_rate, ffmpeg = "ffmpeg", video_args = None):
+        if not can_stream(image_format):
+            raise Exception("[ZOETROPE] ERROR: StreamingEncoder() - " + image_format + " images cannot be streamed, only " + ", ".join(sorted(IMAGE_CODECS)) + "!!!")
+        self.frames = sorted(frames)
+        self.video_path = video_path
+        self.written = 0
+        self.error = None
+        self._position = 0
+        self._ready = {}
+        self._lock = threading.Lock()
+        self._todo = queue.Queue()
+
+        argv = [ffmpeg, "-v", "error", "-y", "-f", "image2pipe", "-framerate", str(frame_rate), "-c:v", IMAGE_CODECS[image_format.lower()], "-i", "-"]
+        self.proc = subprocess.Popen(argv + (video_args or VIDEO_ARGS) + [video_path], stdin = subprocess.PIPE, creationflags = creation_flags())
+        self._writer = threading.Thread(target = self._write_loop)
+        self._writer.daemon = True
+        self._writer.start()
+
+    @property
+    def buffered(self):
+        '''
+        How many frames wait in the reorder buffer for an earlier frame.
+        '''
+        with self._lock:
+            return len(self._ready)
+
+    def add(self, frame, image_path):
+        '''
+        Adds the image of frame. image_path None (or HOLD) shows the frame before it once more.
+        '''
+        with self._lock:
+            self._ready[frame] = image_path or HOLD
+            while self._position < len(self.frames) and self.frames[self._position] in self._ready:
+                self._todo.put(self._ready.pop(self.frames[self._position]))
+                self._position += 1
+
+    def close(self):
+        '''
+        Waits until ffmpeg has the whole video. Returns True if it was encoded.
+        '''
+        with self._lock:
+            for frame in self.frames[self._position:]:
+                self._todo.put(self._ready.pop(frame, HOLD))
+            self._position = len(self.frames)
+        self._todo.put(None)
+        self._writer.join()
+
+        try:
+            self.proc.stdin.close()
+        except (IOError, OSError):
+            pass
+        self.proc.wait()
+        if self.proc.returncode != 0 and self.error is None:
+            self.error = "ffmpeg exited with code " + str(self.proc.returncode) + "."
+        print("[Zoetrope] Streaming Encoder - Wrote " + str(self.written) + " frames into " + self.video_path + " .")
+        return self.error is None
+
+    def _write_loop(self):
+        last_path = None
+        leading_frames = 0
+        while True:
+            image_path = self._todo.get()
+            if image_path is None: break
+            if image_path == HOLD or not os.path.isfile(image_path): image_path = last_path
+            if self.error is not None: continue  # ffmpeg is gone.
+            if image_path is None:  # Nothing to hold yet, the first image covers these frames as well.
+                leading_frames += 1
+                continue
+
+            try:
+                for index in range(leading_frames + 1):
+                    with open(image_path, "rb") as f:
+                        shutil.copyfileobj(f, self.proc.stdin, 1 << 20)
+                    self.written += 1
+                self.proc.stdin.flush()
+                last_path = image_path
+                leading_frames = 0
+            except (IOError, OSError) as e:
+                self.error = "Could not stream " + image_path + ": " + str(e)
+                print("[Zoetrope] Streaming Encoder - " + self.error)
@@ -0,0 +1,162 @@
+##############################################################################################
+
+# animkit_zoetrope_telemetry.py
+# Per-frame render telemetry of Zoetrope batches: wall time, memory and output size.
+# peak_rss is the peak resident memory of the rendering process up to that frame (it never goes down),
+# rss its resident memory right after the frame rendered.
+# Written to /renders/render_report.json and /renders/render_report.csv when a batch ends.
+
+##############################################################################################
+import csv, json, os, sys, threading, time
+
+REPORT_NAME = "render_report"
+CSV_COLUMNS = ["layer", "frame", "seconds", "peak_rss", "rss", "bytes"]
+
+
+# =================================================== Memory ===================================================
+def _windows_memory_counters():
+    '''
+    HELPER for peak_rss_bytes() and rss_bytes(). Returns the PROCESS_MEMORY_COUNTERS of this process, or None.
+    '''
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return counters
+    return None
+
+def peak_rss_bytes():
+    '''
+    Returns the peak resident memory of this process since it started in bytes, or 0 if it cannot be measured.
+    '''
+    if sys.platform.startswith("win"):
+        counters = _windows_memory_counters()
+        return int(counters.PeakWorkingSetSize) if counters else 0
+
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024  # Linux reports kilobytes.
+
+def rss_bytes():
+    '''
+    Returns the resident memory of this process right now in bytes, or 0 if it cannot be measured (macOS).
+    '''
+    if sys.platform.startswith("win"):
+        counters = _windows_memory_counters()
+        return int(counters.WorkingSetSize) if counters else 0
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (IOError, OSError, ValueError, IndexError):
+        return 0
+
+def format_duration(seconds):
+    '''
+    Returns seconds as a short text. Example: format_duration(3725) -> "1h 02m 05s"
+    '''
+    seconds = int(round(seconds))
+    hours, minutes, seconds = seconds // 3600, seconds // 60 % 60, seconds % 60
+    if hours: return "%dh %02dm %02ds" % (hours, minutes, seconds)
+    if minutes: return "%dm %02ds" % (minutes, seconds)
+    return "%ds" % seconds
+
+
+# =================================================== Render Telemetry ===================================================
+class RenderTelemetry(object):
+    '''
+    Collects per-frame telemetry of a batch of total_frames frames and estimates the time left.
+    record_frame() is called when a frame has rendered, record_output() once its image is in place (any thread).
+    '''
+
+    def __init__(self, total_frames):
+        self.total_frames = total_frames
+        self.frames = {}
+        self.started = time.time()
+        self._lock = threading.RLock()
+
+    def _entry(self, layer, frame):
+        return self.frames.setdefault((layer, frame), {"layer": layer, "frame": frame, "seconds": 0.0, "peak_rss": 0, "rss": 0, "bytes": 0})
+
+    def record_frame(self, layer, frame, seconds, peak_rss = None, rss = None):
+        '''
+        Records a rendered frame. peak_rss and rss are measured in this process unless the process that rendered it reported them.
+        '''
+        with self._lock:
+            entry = self._entry(layer, frame)
+            entry["seconds"] = seconds
+            entry["peak_rss"] = peak_rss_bytes() if peak_rss is None else peak_rss
+            entry["rss"] = rss_bytes() if rss is None else rss
+
+    def record_output(self, layer, frame, output_bytes):
+        with self._lock:
+            self._entry(layer, frame)["bytes"] = output_bytes
+
+    @property
+    def rendered_frames(self):
+        with self._lock:
+            return len([entry for entry in self.frames.values() if entry["seconds"]])
+
+    def eta_seconds(self):
+        '''
+        Returns the estimated seconds left, from the average wall time of the frames rendered so far.
+        '''
+        with self._lock:
+            rendered = [entry["seconds"] for entry in self.frames.values() if entry["seconds"]]
+        if not rendered: return None
+        return sum(rendered) / len(rendered) * max(0, self.total_frames - len(rendered))
+
+    def status_text(self):
+        eta = self.eta_seconds()
+        text = "Zoetrope: " + str(self.rendered_frames) + "/" + str(self.total_frames) + " frames"
+        if eta is not None: text += ", ETA " + format_duration(eta)
+        return text
+
+    def layer_summary(self):
+        '''
+        Returns {layer: {"frames", "seconds", "peak_rss", "rss", "bytes"}} over the frames rendered so far, rss is the highest of its frames.
+        '''
+        layers = {}
+        with self._lock:
+            entries = list(self.frames.values())
+        for entry in entries:
+            layer = layers.setdefault(entry["layer"], {"frames": 0, "seconds": 0.0, "peak_rss": 0, "rss": 0, "bytes": 0})
+            layer["frames"] += 1
+            layer["seconds"] += entry["seconds"]
+            layer["peak_rss"] = max(layer["peak_rss"], entry["peak_rss"])
+            layer["rss"] = max(layer["rss"], entry["rss"])
+            layer["bytes"] += entry["bytes"]
+        return layers
+
+    def write_report(self, folder):
+        '''
+        Writes render_report.json (frames, layers and totals) and render_report.csv (one row per frame) into folder.
+        Returns the path of the JSON report.
+        '''
+        with self._lock:
+            frames = sorted(self.frames.values(), key = lambda entry: (entry["layer"], entry["frame"]))
+            report = {"started": self.started, "wall_seconds": time.time() - self.started, "frames": frames, "layers": self.layer_summary(),
+                      "render_seconds": sum(entry["seconds"] for entry in frames), "bytes": sum(entry["bytes"] for entry in frames)}
+
+        json_path = os.path.join(folder, REPORT_NAME + ".json")
+        with open(json_path, "w") as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+
+        with open(os.path.join(folder, REPORT_NAME + ".csv"), "w") as f:
+            writer = csv.DictWriter(f, CSV_COLUMNS, lineterminator="\n")
+            writer.writeheader()
+            for entry in frames:
+                writer.writerow(entry)
+        return json_path
@@ -0,0 +1,115 @@
+##############################################################################################
+
+# animkit_zoetrope_textures.py
+# Converts the textures of a scene to tiled, mipmapped .tx files before a Zoetrope batch, so Arnold does not read
+# or convert untiled images on every frame of every layer. Conversions run in a pool of maketx processes and are
+# cached by source path, modification time and size in /renders/zoetrope_tx_cache.json.
+
+##############################################################################################
+import glob, json, os, re, threading
+from animkit_zoetrope_manifest import write_json_atomic
+from animkit_zoetrope_pool import CommandPool, find_mtoa_executable
+
+TX_CACHE_NAME = "zoetrope_tx_cache.json"
+
+# Texture path tokens (<UDIM>, <U>, <V>, <f>...) and the glob that matches their files.
+TOKEN_PATTERN = re.compile(r"<[^>]+>")
+
+
+# =================================================== Helpers ===================================================
+def find_maketx():
+    '''
+    Returns the path of the maketx executable shipped with MtoA, or None if it cannot be found.
+    '''
+    return find_mtoa_executable("maketx")
+
+def maketx_command(maketx = None):
+    '''
+    Returns a function (source, tx_path) -> argv that converts one texture with maketx.
+    Pass another executable (e.g. a stub script) as maketx to test the pre-flight without Arnold.
+    '''
+    maketx = maketx or find_maketx() or "maketx"
+
+    def command(source, tx_path):
+        return [maketx, "--oiio", "--monochrome-detect", "--opaque-detect", source, "-o", tx_path]
+    return command
+
+def tx_path(source):
+    return os.path.splitext(source)[0] + ".tx"
+
+def expand_texture_path(path):
+    '''
+    Returns the files a texture path stands for, every tile of a <UDIM> path for example.
+    '''
+    if TOKEN_PATTERN.search(path):
+        return sorted(glob.glob(TOKEN_PATTERN.sub("*", path)))
+    return [path] if os.path.isfile(path) else []
+
+
+# =================================================== Texture Cache ===================================================
+class TextureCache(object):
+    '''
+    Remembers the source path, modification time and size every .tx file was converted from.
+    '''
+
+    def __init__(self, cache_path):
+        self.path = cache_path
+        self.data = {}
+        self._lock = threading.Lock()
+        if os.path.isfile(cache_path):
+            try:
+                with open(cache_path) as f:
+                    self.data = json.load(f)
+            except ValueError:
+                print("[Zoetrope] Texture Cache - Ignoring unreadable cache at " + cache_path + " .")
+
+    @staticmethod
+    def stamp(source):
+        stat = os.stat(source)
+        return {"mtime": stat.st_mtime, "bytes": stat.st_size}
+
+    def is_current(self, source):
+        '''
+        Returns True if source was converted since it last changed and its .tx is still there.
+        '''
+        entry = self.data.get(os.path.normcase(os.path.abspath(source)))
+        if entry is None or not os.path.isfile(entry["tx"]):
+            return False
+        stamp = self.stamp(source)
+        return entry["mtime"] == stamp["mtime"] and entry["bytes"] == stamp["bytes"]
+
+    def record(self, source, tx):
+        with self._lock:
+            self.data[os.path.normcase(os.path.abspath(source))] = dict(self.stamp(source), tx = tx)
+
+    def save(self):
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder): os.makedirs(folder)
+        with self._lock:
+            write_json_atomic(self.path, self.data)
+
+
+# =================================================== Pre-flight ===================================================
+def convert_textures(sources, cache, command = None, max_procs = 1, governor = None):
+    '''
+    Converts every source that is not a .tx already and changed since its last conversion, max_procs at a time.
+    command(source, tx_path) returns the argv of one conversion, see maketx_command.
+    Returns (converted sources, sources left alone, failed results).
+    '''
+    command = command or maketx_command()
+    todo = [source for source in sources if os.path.splitext(source)[1].lower() != ".tx" and not cache.is_current(source)]
+    unchanged = [source for source in sources if source not in todo]
+
+    def on_result(result):
+        if result["ok"]: cache.record(result["source"], result["tx"])
+
+    pool = CommandPool(max_procs, on_result = on_result, governor = governor)
+    for source in todo:
+        pool.submit(command(source, tx_path(source)), {"source": source, "tx": tx_path(source)})
+    results = pool.join()
+
+    converted = [result["source"] for result in results if result["ok"]]
+    failed = [result for result in results if not result["ok"]]
+    cache.save()
+    print("[Zoetrope] Texture Pre-flight - Converted " + str(len(converted)) + " textures, " + str(len(unchanged)) + " were up to date, " + str(len(failed)) + " failed.")
+    return converted, unchanged, failed
@@ -0,0 +1,110 @@
+##############################################################################################
+
+# animkit_zoetrope_tiles.py
+# Splits one large frame into render regions and stitches the rendered tiles back into one image.
+# Tiles are decoded and the result is encoded by ffmpeg, NumPy only lays the pixels out, one row of tiles at a time,
+# so memory stays at one band of the final image no matter how large it is.
+# NumPy is imported when stitching starts, everything else runs on a plain Python install.
+
+##############################################################################################
+import json, math, subprocess
+from animkit_zoetrope_pool import creation_flags
+
+# Tiles are decoded to and stitched in 16 bit RGBA, so 8 and 16 bit tiles both survive unchanged.
+RAW_PIXEL_FORMAT = "rgba64le"
+
+
+# =================================================== Tile Layout ===================================================
+def split_tiles(width, height, count):
+    '''
+    Splits a width x height frame into a grid of about count tiles, each as close to square as possible.
+    Returns a list of {"index", "x0", "y0", "x1", "y1"}, in pixels from the top left, x1 and y1 exclusive.
+    Example: split_tiles(100, 50, 2) -> [{index 0, x0 0, y0 0, x1 50, y1 50}, {index 1, x0 50, y0 0, x1 100, y1 50}]
+    '''
+    count = max(1, min(int(count), width, height))
+
+    # The fewest tiles past count, then the squarest tiles, they have the least edge per pixel.
+    def score(rows):
+        columns = int(math.ceil(count / float(rows)))
+        return rows * columns - count, abs(math.log(float(width) * rows / (height * columns)))
+    rows = min(range(1, count + 1), key = score)
+    columns = int(math.ceil(count / float(rows)))
+
+    tiles = []
+    for row in range(rows):
+        for column in range(columns):
+            tiles.append({"index": len(tiles),
+                          "x0": width * column // columns, "x1": width * (column + 1) // columns,
+                          "y0": height * row // rows, "y1": height * (row + 1) // rows})
+    return tiles
+
+def maya_region(tile, height):
+    '''
+    Returns the (left, right, bottom, top) render region of a tile, in Maya's inclusive pixels from the bottom left.
+    '''
+    return tile["x0"], tile["x1"] - 1, height - tile["y1"], height - 1 - tile["y0"]
+
+def tile_rows(tiles):
+    '''
+    Returns the tiles grouped into rows, top to bottom, each row left to right.
+    '''
+    rows = {}
+    for tile in tiles:
+        rows.setdefault(tile["y0"], []).append(tile)
+    return [sorted(rows[y0], key = lambda tile: tile["x0"]) for y0 in sorted(rows)]
+
+
+# =================================================== Tile Stitcher ===================================================
+def probe_image(image_path, ffprobe = "ffprobe"):
+    '''
+    Returns (width, height) of an image.
+    '''
+    output = subprocess.check_output([ffprobe, "-v", "error", "-select_streams", "v:0", "-show_entries", "stream=width,height",
+                                      "-of", "json", image_path], creationflags = creation_flags())
+    stream = json.loads(output.decode("utf-8"))["streams"][0]
+    return int(stream["width"]), int(stream["height"])
+
+def read_tile(numpy, tile, image_path, width, height, ffmpeg = "ffmpeg", ffprobe = "ffprobe"):
+    '''
+    Returns the pixels of a tile as a (rows, columns, 4) uint16 array.
+    Arnold writes either the tile alone or the whole frame with only the tile filled in, the latter is cropped while decoding.
+    '''
+    tile_width, tile_height = tile["x1"] - tile["x0"], tile["y1"] - tile["y0"]
+    image_width, image_height = probe_image(image_path, ffprobe)
+    argv = [ffmpeg, "-v", "error", "-i", image_path]
+    if (image_width, image_height) == (width, height) and (tile_width, tile_height) != (width, height):
+        argv += ["-vf", "crop=%d:%d:%d:%d" % (tile_width, tile_height, tile["x0"], tile["y0"])]
+    elif (image_width, image_height) != (tile_width, tile_height):
+        raise Exception("[ZOETROPE] ERROR: read_tile() - " + image_path + " is " + str(image_width) + "x" + str(image_height)
+                        + ", expected the tile or the whole frame!!!")
+    argv += ["-f", "rawvideo", "-pix_fmt", RAW_PIXEL_FORMAT, "-"]
+
+    data = subprocess.check_output(argv, creationflags = creation_flags())
+    return numpy.frombuffer(data, dtype = "<u2").reshape(tile_height, tile_width, 4)
+
+def stitch_tiles(tiles, tile_paths, width, height, output_path, ffmpeg = "ffmpeg", ffprobe = "ffprobe"):
+    '''
+    Stitches the images of tiles (see split_tiles) into one width x height image at output_path.
+    tile_paths maps a tile index to its image. Rows of tiles are decoded and streamed into the encoder one after another.
+    '''
+    try:
+        import numpy
+    except ImportError:
+        raise Exception("[ZOETROPE] ERROR: stitch_tiles() - NumPy is needed to stitch tiles, install it for this Python!!!")
+
+    encoder = subprocess.Popen([ffmpeg, "-v", "error", "-y", "-f", "rawvideo", "-pix_fmt", RAW_PIXEL_FORMAT, "-s", "%dx%d" % (width, height),
+                                "-i", "-", "-frames:v", "1", output_path], stdin = subprocess.PIPE, creationflags = creation_flags())
+    try:
+        for row in tile_rows(tiles):
+            band = numpy.zeros((row[0]["y1"] - row[0]["y0"], width, 4), dtype = "<u2")
+            for tile in row:
+                band[:, tile["x0"]:tile["x1"]] = read_tile(numpy, tile, tile_paths[tile["index"]], width, height, ffmpeg, ffprobe)
+            encoder.stdin.write(band.tobytes())
+            del band
+    finally:
+        encoder.stdin.close()
+        encoder.wait()
+    if encoder.returncode != 0:
+        raise Exception("[ZOETROPE] ERROR: stitch_tiles() - ffmpeg could not write " + output_path + "!!!")
+    print("[Zoetrope] Tile Stitcher - Stitched " + str(len(tiles)) + " tiles into " + output_path + " .")
+    return output_path
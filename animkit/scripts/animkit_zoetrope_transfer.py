@@ -0,0 +1,133 @@
+##############################################################################################
+
+# animkit_zoetrope_transfer.py
+# Moves frames rendered to a local scratch folder onto the project share.
+# Arnold writes to local disk (or tmpfs) without paying network latency on every small write, a FrameMover thread
+# then copies the finished frames over in batches with large sequential reads and writes, verifies every copy
+# and only then deletes the scratch image.
+
+##############################################################################################
+import hashlib, os, shutil, threading, time, traceback
+from animkit_zoetrope_manifest import file_checksum, replace_file
+
+# Copies read and write this much at once.
+COPY_BUFFER_BYTES = 16 << 20
+
+# A batch starts once this many frames are waiting, or once the oldest one waited BATCH_SECONDS.
+BATCH_FRAMES = 8
+BATCH_SECONDS = 15.0
+
+
+# =================================================== Verified Copy ===================================================
+def copy_verified(source, destination, buffer_bytes = COPY_BUFFER_BYTES):
+    '''
+    Copies source to destination through destination.part in large blocks, reads the copy back and compares its
+    checksum with the one of source before swapping it in. Returns the md5 hex digest.
+    '''
+    folder = os.path.dirname(destination)
+    if folder and not os.path.isdir(folder): os.makedirs(folder)
+    temp_path = destination + ".part"
+    digest = hashlib.md5()
+    with open(source, "rb") as src:
+        with open(temp_path, "wb") as dst:
+            for block in iter(lambda: src.read(buffer_bytes), b""):
+                digest.update(block)
+                dst.write(block)
+            dst.flush()
+            os.fsync(dst.fileno())
+    checksum = digest.hexdigest()
+    if file_checksum(temp_path, buffer_bytes) != checksum:
+        os.remove(temp_path)
+        raise Exception("[ZOETROPE] ERROR: copy_verified() - The copy of " + source + " does not match the original!!!")
+    shutil.copymode(source, temp_path)
+    replace_file(temp_path, destination)
+    return checksum
+
+
+# =================================================== Frame Mover ===================================================
+class FrameMover(object):
+    '''
+    Moves files on a background thread, batch_frames at a time or whatever waited batch_seconds.
+    Each move is a copy_verified, the source is deleted only after the copy checked out, then on_moved(destination)
+    is called. Failures are appended to errors as (info, traceback text) like TaskPool.errors and leave the source alone.
+    wait() moves everything submitted so far right away, close() also stops the thread.
+    '''
+
+    def __init__(self, batch_frames = BATCH_FRAMES, batch_seconds = BATCH_SECONDS, errors = None, copy = copy_verified):
+        self.batch_frames = max(1, int(batch_frames))
+        self.batch_seconds = batch_seconds
+        self.errors = errors if errors is not None else []
+        self.copy = copy
+        self.moved = 0
+        self.moved_bytes = 0
+        self.copy_seconds = 0.0
+        self._pending = []
+        self._busy = False
+        self._flushing = 0
+        self._closing = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target = self._loop)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self, source, destination, info = None, on_moved = None):
+        with self._condition:
+            self._pending.append((source, destination, info, on_moved, time.time()))
+            self._condition.notify_all()
+
+    def wait(self):
+        '''
+        Blocks until everything submitted so far is moved. Returns errors.
+        '''
+        with self._condition:
+            self._flushing += 1
+            self._condition.notify_all()
+            while self._pending or self._busy:
+                self._condition.wait(1.0)
+            self._flushing -= 1
+        return self.errors
+
+    def close(self):
+        self.wait()
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._thread.join()
+        if self.moved:
+            print("[Zoetrope] Frame Mover - Moved " + str(self.moved) + " frames (" + str(self.moved_bytes >> 20) + " MB) in "
+                  + "%.1f" % self.copy_seconds + " seconds of copying.")
+        return self.errors
+
+    def _ready(self):
+        if not self._pending: return False
+        if self._flushing or self._closing or len(self._pending) >= self.batch_frames: return True
+        return time.time() - self._pending[0][4] >= self.batch_seconds
+
+    def _loop(self):
+        while True:
+            with self._condition:
+                while not self._ready():
+                    if self._closing: return
+                    self._condition.wait(1.0)
+                batch, self._pending = self._pending, []
+                self._busy = True
+            try:
+                for source, destination, info, on_moved, submitted in batch:
+                    self._move(source, destination, info, on_moved)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _move(self, source, destination, info, on_moved):
+        try:
+            start = time.time()
+            size = os.path.getsize(source)
+            self.copy(source, destination)
+            os.remove(source)
+            self.copy_seconds += time.time() - start
+            self.moved += 1
+            self.moved_bytes += size
+            if on_moved is not None: on_moved(destination)
+        except Exception:
+            self.errors.append((info, traceback.format_exc()))
@@ -0,0 +1,103 @@
+##############################################################################################
+
+# animkit_zoetrope_worker.py
+# Headless Zoetrope render worker. Started by animkit_zoetrope.batch_render_workers() as:
+#     mayapy animkit_zoetrope_worker.py <snapshot scene> <original scene>
+# Reads one JSON work item per line on stdin and answers each with one result line on stdout.
+# Started by animkit_zoetrope.join_render_queue() (or by hand, on any workstation) as:
+#     mayapy animkit_zoetrope_worker.py --queue <queue folder> [arnold threads]
+# Renders tasks of the shared work queue until it is empty, see animkit_zoetrope_queue.
+
+##############################################################################################
+import json, sys, time, traceback
+from animkit_zoetrope_pool import encode_message
+from animkit_zoetrope_telemetry import peak_rss_bytes, rss_bytes
+
+
+def reply(payload):
+    sys.stdout.write(encode_message(payload) + "\n")
+    sys.stdout.flush()
+
+def open_snapshot(snapshot, scene):
+    '''
+    Boots Maya without UI and opens the snapshot under the name of the original scene,
+    so render_frame() writes into the same renders/ folder as an interactive render.
+    '''
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    import maya.cmds as cmds
+    cmds.loadPlugin("mtoa", quiet=True)
+    cmds.file(snapshot, open=True, force=True)
+    cmds.file(rename=scene)
+
+def render_item(session, item):
+    import maya.cmds as cmds
+
+    session.switch_layer(item["layer"])
+    cmds.currentTime(item["frame"])
+    if item.get("region"):
+        left, right, bottom, top = item["region"]
+        session.set("defaultRenderGlobals.useRenderRegion", 1)
+        session.set("defaultRenderGlobals.left", left)
+        session.set("defaultRenderGlobals.rght", right)
+        session.set("defaultRenderGlobals.bot", bottom)
+        session.set("defaultRenderGlobals.top", top)
+    errors = len(session.finaliser.errors)
+    image_path = session.render(item["width"], item["height"], item["frame"], item["layer"], output_folder = item.get("output_folder"))
+
+    # The scheduler records the frame as soon as it hears back, so the image has to be in place first.
+    session.wait()
+    if len(session.finaliser.errors) > errors:
+        raise Exception(session.finaliser.errors[-1][1])
+    return image_path
+
+def open_session(item):
+    '''
+    Applies the render settings for the life of the worker, when the first item arrives.
+    The snapshot is thrown away with the worker, so the session is never restored.
+    '''
+    import animkit_zoetrope
+    overrides = {}
+    if item.get("threads"):
+        overrides = {"defaultArnoldRenderOptions.threads_autodetect": 0, "defaultArnoldRenderOptions.threads": item["threads"]}
+    return animkit_zoetrope.RenderSession(item["format"], overrides).__enter__()
+
+def main(argv):
+    open_snapshot(argv[1], argv[2])
+    session = None
+    for line in iter(sys.stdin.readline, ""):
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        start = time.time()
+        try:
+            if session is None:
+                session = open_session(item)
+            image_path = render_item(session, item)
+            reply({"ok": True, "seconds": time.time() - start, "path": image_path, "peak_rss": peak_rss_bytes(), "rss": rss_bytes()})
+        except Exception:
+            reply({"ok": False, "seconds": time.time() - start, "error": traceback.format_exc()})
+
+def main_queue(queue_folder, threads=None):
+    from animkit_zoetrope_queue import WorkQueue
+    work_queue = WorkQueue(queue_folder)
+    batch = work_queue.read_batch()
+    open_snapshot(batch["snapshot"], batch["scene"])
+
+    sessions = []
+    def render(item):
+        if threads:
+            item = dict(item, threads=int(threads))
+        if not sessions:
+            sessions.append(open_session(item))
+        start = time.time()
+        image_path = render_item(sessions[0], item)
+        return {"seconds": time.time() - start, "path": image_path, "peak_rss": peak_rss_bytes(), "rss": rss_bytes()}
+    work_queue.work(render)
+
+
+if __name__ == "__main__":
+    if sys.argv[1] == "--queue":
+        main_queue(*sys.argv[2:4])
+    else:
+        main(sys.argv)